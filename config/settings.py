@@ -9,11 +9,48 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_SERVICE_ROLE_KEY: str
 
+    # Supabase HTTP pool (db/database.py)
+    SUPABASE_HTTP2: bool = False
+    SUPABASE_POOL_MAX_CONNECTIONS: int = 100
+    SUPABASE_POOL_MAX_KEEPALIVE: int = 20
+    SUPABASE_KEEPALIVE_EXPIRY_SEC: float = 30.0
+    SUPABASE_CONNECT_TIMEOUT_SEC: float = 5.0
+    SUPABASE_READ_TIMEOUT_SEC: float = 15.0
+    SUPABASE_POOL_TIMEOUT_SEC: float = 5.0
+    SUPABASE_WARMUP_CONNECTIONS: int = 4
+
     # JWT (reserved - not used with Supabase Auth)
     SUPABASE_JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 60
 
+    # Identity cache (dependencies/auth.py)
+    IDENTITY_CACHE_MAX_TOKENS: int = 10_000
+    IDENTITY_CACHE_MAX_USERS: int = 10_000
+    IDENTITY_CACHE_TTL_SEC: int = 600
+
+    # reference catalog: emotion_tags / badges / actions (services/catalog_service.py)
+    CATALOG_TTL_SEC: float = 300.0
+
+    # GET /mood/analysis per-user 결과 캐시 (services/mood_analysis_cache.py)
+    MOOD_ANALYSIS_CACHE_MAX_ENTRIES: int = 20_000
+    MOOD_ANALYSIS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    MOOD_ANALYSIS_CACHE_TTL_SEC: float = 60.0
+
+    # write 후 badge 평가 등 background 처리 (services/post_event_queue.py)
+    POST_EVENT_QUEUE_MAX_SIZE: int = 1000
+    POST_EVENT_WORKERS: int = 2
+    POST_EVENT_MAX_RETRIES: int = 3
+    POST_EVENT_RETRY_BASE_DELAY_SEC: float = 0.5
+
+    # GET /events/stream (SSE, core/pubsub.py)
+    SSE_HEARTBEAT_SEC: float = 25.0
+    SSE_QUEUE_SIZE: int = 16
+    SSE_MAX_CONNECTIONS: int = 10_000
+
+    # /internal/* 운영용 엔드포인트 (미설정 시 비활성)
+    INTERNAL_API_KEY: str | None = None
+
     class Config:
         env_file = ".env"
         extra = "forbid"   # 정의 안 된 env 있으면 에러
@@ -0,0 +1,74 @@
+# core/compact.py
+from __future__ import annotations
+
+import gzip
+from typing import Any, Dict, List, Optional, Sequence
+
+import brotli
+import orjson
+from fastapi import Request, Response
+
+# Accept 로 협상하는 column 배열 응답 (?format=columnar 와 같음)
+COLUMNAR_MEDIA_TYPE = "application/vnd.weavemo.columnar+json"
+
+# 이보다 작은 body 는 압축하지 않는다 (header / CPU 가 더 큼)
+MIN_COMPRESS_BYTES = 1024
+
+# 같은 URL 이 Accept / Accept-Encoding 으로 다른 body → 기본 JSON 응답에도 붙인다
+VARY = "Accept, Accept-Encoding"
+
+
+def wants_columnar(request: Request, format: Optional[str] = None) -> bool:
+    if format is not None:
+        return format == "columnar"
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def to_columns(items: Sequence[Any], keys: Sequence[str]) -> Dict[str, List[Any]]:
+    """[{a, b}, ...] (dict 또는 model) → {a: [...], b: [...]}. key 를 element 마다 반복하지 않는다"""
+    return {
+        k: [item.get(k) if isinstance(item, dict) else getattr(item, k) for item in items]
+        for k in keys
+    }
+
+
+def negotiated_encoding(request: Request) -> Optional[str]:
+    """br / gzip / None. compact 응답의 ETag 에도 넣는다 (coding 별로 다른 body)"""
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in request.headers.get("accept-encoding", "").split(",")
+    }
+    if "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compact_response(
+    request: Request,
+    payload: Any,
+    *,
+    response: Optional[Response] = None,
+    media_type: str = "application/json",
+) -> Response:
+    """
+    orjson 으로 직렬화 + Accept-Encoding 에 따라 br / gzip.
+    response_model 검증을 거치지 않는 Response 를 바로 돌려준다.
+    response: 의존성으로 받은 Response 의 header (ETag 등) 를 옮겨 담는다.
+    """
+    body = orjson.dumps(payload)
+    # response.headers 의 key 는 소문자 → 같은 key 로 덮어쓴다
+    headers = dict(response.headers) if response is not None else {}
+    headers.pop("content-length", None)
+    headers["vary"] = VARY
+
+    encoding = negotiated_encoding(request) if len(body) >= MIN_COMPRESS_BYTES else None
+    if encoding == "br":
+        body = brotli.compress(body, quality=4)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=5)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,119 @@
+# core/dataloader.py
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+from core.request_scope import current_scope
+
+
+class DataLoader:
+    """
+    request 안에서 key 조회를 모아 주는 loader.
+
+    - memoize: 같은 key 는 request 동안 한 번만 조회
+    - batch:   같은 event loop tick 에 들어온 key 들은 batch_fn 한 번으로
+               (asyncio.gather 로 동시에 부른 load 들이 하나의 in_() 조회가 된다)
+    - 실패한 key 는 memo 하지 않는다 (다음 load 에서 재시도)
+
+    batch_fn(keys) 는 keys 와 같은 순서 / 길이의 값 list 를 돌려줘야 한다.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], Awaitable[Sequence[Any]]],
+        *,
+        max_batch_size: int = 100,
+    ):
+        self._batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[tuple[Hashable, asyncio.Future]] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable) -> Any:
+        fut = self._cache.get(key)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._cache[key] = fut
+            self._queue.append((key, fut))
+            if len(self._queue) == 1:
+                loop.call_soon(self._dispatch)
+        # 한 caller 가 취소돼도 같은 key 를 기다리는 다른 caller 는 영향 없게
+        return await asyncio.shield(fut)
+
+    async def load_many(self, keys: Sequence[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        if key not in self._cache:
+            fut = asyncio.get_running_loop().create_future()
+            fut.set_result(value)
+            self._cache[key] = fut
+
+    def clear(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        for i in range(0, len(queue), self.max_batch_size):
+            task = asyncio.create_task(self._run_batch(queue[i:i + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[tuple[Hashable, asyncio.Future]]) -> None:
+        keys = [key for key, _ in batch]
+        try:
+            values = await self._batch_fn(keys)
+            if len(values) != len(keys):
+                raise ValueError(f"batch_fn returned {len(values)} values for {len(keys)} keys")
+        except Exception as e:
+            for key, fut in batch:
+                if self._cache.get(key) is fut:
+                    del self._cache[key]
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for (_, fut), value in zip(batch, values):
+            if not fut.done():
+                fut.set_result(value)
+
+
+def rows_loader(supabase, table: str, column: str, columns: str = "*") -> DataLoader:
+    """
+    table 의 column 값 → row list loader. 현재 request 안에서는 같은 loader 를 돌려준다.
+    (request 밖에서 부르면 memo 없이 batch 만 되는 일회용 loader)
+
+        rows = await rows_loader(supabase, "user_stats", "user_id").load(user_id)
+    """
+    ctx = current_scope()
+    cache_key = ("rows", table, column, columns)
+    if ctx is not None and cache_key in ctx.loaders:
+        return ctx.loaders[cache_key]
+
+    async def batch(keys: List[Hashable]) -> List[List[Dict[str, Any]]]:
+        res = await supabase.table(table).select(columns).in_(column, keys).execute()
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for row in res.data or []:
+            grouped.setdefault(str(row[column]), []).append(row)
+        return [grouped.get(str(k), []) for k in keys]
+
+    loader = DataLoader(batch)
+    if ctx is not None:
+        ctx.loaders[cache_key] = loader
+    return loader
+
+
+def invalidate_rows(table: str, key: Optional[Hashable] = None) -> None:
+    # 같은 request 에서 table 에 쓴 뒤 다시 읽어야 할 때
+    ctx = current_scope()
+    if ctx is None:
+        return
+    for cache_key, loader in ctx.loaders.items():
+        if cache_key[0] == "rows" and cache_key[1] == table:
+            loader.clear(key)
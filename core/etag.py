@@ -0,0 +1,53 @@
+# core/etag.py
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# 브라우저 / 앱 HTTP 캐시가 매번 재검증하도록 (사용자별 응답이므로 private)
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """
+    version / 날짜 / query 등 응답을 결정하는 값들로 weak ETag 생성.
+    body 를 만들지 않고도 계산할 수 있어야 한다.
+    """
+    raw = "|".join(str(p) for p in parts)
+    return 'W/"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match 는 weak 비교 (RFC 9110 13.1.2)
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(t) for t in if_none_match.split(",")}
+
+
+def conditional(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    응답에 ETag 를 달고, 클라이언트가 같은 ETag 를 갖고 있으면 304 Response 를 돌려준다.
+
+        not_modified = conditional(request, response, etag)
+        if not_modified is not None:
+            return not_modified
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        # 304 도 200 과 같은 Vary (content negotiation 하는 endpoint)
+        if "vary" in response.headers:
+            headers["Vary"] = response.headers["vary"]
+        return Response(status_code=304, headers=headers)
+    return None
@@ -0,0 +1,82 @@
+# core/pubsub.py
+from __future__ import annotations
+
+import asyncio
+import itertools
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+# (event id, event name, data). None = hub 종료
+Message = Optional[Tuple[int, str, Dict[str, Any]]]
+
+
+class PubSubHub:
+    """
+    프로세스 내 사용자별 pub/sub (worker 단위).
+
+    - 연결 1개 = 작은 bounded asyncio.Queue 1개 (별도 task 없음)
+    - publish(): put_nowait 만. 느린 구독자는 가장 오래된 메시지부터 버린다 (publisher 를 막지 않음)
+    - close(): 모든 구독자에게 종료 신호 (graceful shutdown)
+    """
+
+    def __init__(self, *, queue_size: int, max_connections: int):
+        self.queue_size = queue_size
+        self.max_connections = max_connections
+        self._subs: Dict[int, Set[asyncio.Queue]] = {}
+        self._ids = itertools.count(1)
+        self._connections = 0
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def full(self) -> bool:
+        return self._connections >= self.max_connections
+
+    @contextmanager
+    def subscribe(self, key: int) -> Iterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subs.setdefault(key, set()).add(queue)
+        self._connections += 1
+        try:
+            yield queue
+        finally:
+            self._connections -= 1
+            subs = self._subs.get(key)
+            if subs is not None:
+                subs.discard(queue)
+                if not subs:
+                    del self._subs[key]
+
+    def publish(self, key: int, event: str, data: Dict[str, Any]) -> int:
+        subs = self._subs.get(key)
+        self.published += 1
+        if not subs:
+            return 0
+
+        message = (next(self._ids), event, data)
+        for queue in subs:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+            self.delivered += 1
+        return len(subs)
+
+    def close(self) -> None:
+        for subs in self._subs.values():
+            for queue in subs:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subs),
+            "connections": self._connections,
+            "max_connections": self.max_connections,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
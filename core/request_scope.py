@@ -0,0 +1,73 @@
+# core/request_scope.py
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Iterator, Optional
+
+from starlette.datastructures import MutableHeaders
+
+
+class RequestScope:
+    """
+    HTTP 요청 1건 동안 공유되는 상태.
+    - loaders: request-scoped DataLoader (core/dataloader.py)
+    - db_hops: Supabase round trip 수 (X-DB-Hops 응답 header)
+    """
+
+    def __init__(self):
+        self.loaders: Dict[Hashable, Any] = {}
+        self.db_hops = 0
+
+
+_current: ContextVar[Optional[RequestScope]] = ContextVar("request_scope", default=None)
+
+
+def current_scope() -> Optional[RequestScope]:
+    return _current.get()
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestScope]:
+    # HTTP 요청 밖(background job, script)에서도 같은 memo / batch 를 쓰고 싶을 때
+    ctx = RequestScope()
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+
+
+def count_db_hop() -> None:
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.db_hops += 1
+
+
+class RequestScopeMiddleware:
+    """
+    요청마다 RequestScope 를 열고, 응답 header 에 X-DB-Hops 를 단다.
+    (pure ASGI middleware → endpoint 와 같은 context 에서 실행된다)
+
+    header 는 http.response.start 시점 값이라, body 를 흘려보내며 query 하는
+    StreamingResponse (history ndjson, /export, /events) 는 끝까지 셀 수 없다.
+    → Content-Length 가 없는 (= streaming) 응답에는 header 를 달지 않는다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_scope() as ctx:
+            async def send_with_hops(message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    if "content-length" in headers:
+                        headers.append("X-DB-Hops", str(ctx.db_hops))
+                await send(message)
+
+            await self.app(scope, receive, send_with_hops)
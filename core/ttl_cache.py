@@ -0,0 +1,126 @@
+# core/ttl_cache.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    프로세스 내 LRU + TTL 캐시.
+
+    - maxsize 초과 시 가장 오래 안 쓴 항목부터 제거 (메모리 상한)
+    - maxweight + weigher 를 주면 항목별 추정 크기(bytes) 합으로도 상한 적용
+    - 항목별 만료: 기본 ttl 또는 expires_at(epoch seconds, 예: JWT exp) 중 빠른 쪽
+    - sync route(threadpool)에서도 쓰이므로 lock으로 보호
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        ttl: float,
+        maxweight: Optional[int] = None,
+        weigher: Optional[Callable[[Any], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxweight = maxweight
+        self.weigher = weigher
+        self._data: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+
+            deadline, value, weight = item
+            if deadline <= now:
+                del self._data[key]
+                self._weight -= weight
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        *,
+        ttl: Optional[float] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        now = time.monotonic()
+        deadline = now + (self.ttl if ttl is None else ttl)
+
+        # expires_at은 wall clock 기준 → monotonic으로 환산
+        if expires_at is not None:
+            deadline = min(deadline, now + (expires_at - time.time()))
+
+        if deadline <= now:
+            return
+
+        weight = self.weigher(value) if self.weigher else 0
+        if self.maxweight is not None and weight > self.maxweight:
+            return
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._weight -= old[2]
+
+            self._data[key] = (deadline, value, weight)
+            self._weight += weight
+
+            while len(self._data) > self.maxsize or (
+                self.maxweight is not None and self._weight > self.maxweight
+            ):
+                _, (_, _, evicted_weight) = self._data.popitem(last=False)
+                self._weight -= evicted_weight
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is not None:
+                self._weight -= item[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "weight": self._weight,
+            "maxweight": self.maxweight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -1,14 +1,178 @@
-from supabase import create_client, Client
+import asyncio
+import importlib.util
+import logging
+
+import httpx
+from supabase import AsyncClient, AsyncClientOptions
 from config.settings import settings
+from core.request_scope import count_db_hop
+
+logger = logging.getLogger(__name__)
+
+
+class _MeteredTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport + pool 포화도 계측.
+    in_flight 가 max_connections 에 붙어 있으면 pool 대기(saturation) 중이라는 뜻.
+    """
+
+    def __init__(self, *, limits: httpx.Limits, **kwargs):
+        super().__init__(limits=limits, **kwargs)
+        self.max_connections = limits.max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.errors = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        count_db_hop()
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        connections = self._pool.connections
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "max_connections": self.max_connections,
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": (
+                round(self.in_flight / self.max_connections, 3)
+                if self.max_connections else None
+            ),
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
 
-_supabase: Client | None = None
+class SupabaseClientManager:
+    """
+    worker 당 하나의 httpx connection pool 을 공유하는 Supabase client 묶음.
 
+    - data: service role 로 table / rpc 호출 (모든 DB I/O)
+    - auth: sign_up / sign_in 전용
+      (sign_in 이 client 의 Authorization 헤더를 user 토큰으로 바꾸기 때문에
+       data client 와 분리하되, connection pool 은 같이 쓴다)
+
+    FastAPI lifespan 에서 start() / close() 된다.
+    """
+
+    def __init__(self):
+        self._transport: _MeteredTransport | None = None
+        self._http: httpx.AsyncClient | None = None
+        self._data: AsyncClient | None = None
+        self._auth: AsyncClient | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._http is not None
+
+    def _build_http(self) -> httpx.AsyncClient:
+        http2 = settings.SUPABASE_HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("SUPABASE_HTTP2=true but 'h2' is not installed; falling back to HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY_SEC,
+        )
+        self._transport = _MeteredTransport(limits=limits, http2=http2, retries=1)
+
+        return httpx.AsyncClient(
+            transport=self._transport,
+            timeout=httpx.Timeout(
+                connect=settings.SUPABASE_CONNECT_TIMEOUT_SEC,
+                read=settings.SUPABASE_READ_TIMEOUT_SEC,
+                write=settings.SUPABASE_READ_TIMEOUT_SEC,
+                pool=settings.SUPABASE_POOL_TIMEOUT_SEC,
+            ),
+            http2=http2,
+        )
 
-def get_supabase() -> Client:
-    global _supabase
-    if _supabase is None:
-        _supabase = create_client(
+    def _build_client(self) -> AsyncClient:
+        return AsyncClient(
             settings.SUPABASE_URL,
             settings.SUPABASE_SERVICE_ROLE_KEY,  # ⚠️ backend 전용
+            AsyncClientOptions(
+                httpx_client=self._http,
+                auto_refresh_token=False,
+                persist_session=False,
+            ),
         )
-    return _supabase
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self.started:
+                return
+            self._http = self._build_http()
+            self._data = self._build_client()
+            self._auth = self._build_client()
+
+        await self.warm_up()
+
+    async def warm_up(self) -> None:
+        """
+        keep-alive 연결을 미리 열어 첫 요청의 TCP/TLS handshake 비용을 없앤다.
+        실패해도 서버 기동은 막지 않는다.
+        """
+        n = settings.SUPABASE_WARMUP_CONNECTIONS
+        if n <= 0:
+            return
+
+        url = f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/health"
+        headers = {"apikey": settings.SUPABASE_SERVICE_ROLE_KEY}
+
+        results = await asyncio.gather(
+            *(self._http.get(url, headers=headers) for _ in range(n)),
+            return_exceptions=True,
+        )
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed:
+            logger.warning("supabase warm-up: %d/%d requests failed (%r)", len(failed), n, failed[0])
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._http is not None:
+                await self._http.aclose()
+            self._http = self._transport = None
+            self._data = self._auth = None
+
+    async def data(self) -> AsyncClient:
+        if not self.started:
+            await self.start()
+        return self._data
+
+    async def auth(self) -> AsyncClient:
+        if not self.started:
+            await self.start()
+        return self._auth
+
+    def stats(self) -> dict:
+        if self._transport is None:
+            return {"started": False}
+        return {"started": True, **self._transport.stats()}
+
+
+supabase_manager = SupabaseClientManager()
+
+
+async def get_supabase() -> AsyncClient:
+    return await supabase_manager.data()
+
+
+async def get_auth_supabase() -> AsyncClient:
+    return await supabase_manager.auth()
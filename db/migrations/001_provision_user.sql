@@ -0,0 +1,47 @@
+-- 001_provision_user.sql
+-- users + user_stats get-or-create 를 한 번의 RPC(한 트랜잭션)로 처리한다.
+-- 동시 첫 요청이 와도 unique index + on conflict 로 중복 insert 가 생기지 않는다.
+
+create unique index if not exists users_auth_uid_key
+    on public.users (auth_uid);
+
+create unique index if not exists user_stats_user_id_key
+    on public.user_stats (user_id);
+
+
+create or replace function public.provision_user(
+    p_auth_uid uuid,
+    p_email text,
+    p_nickname text
+) returns bigint
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_user_id bigint;
+begin
+    -- 1️⃣ users (이미 있으면 기존 row 사용)
+    insert into users (auth_uid, email, nickname)
+    values (p_auth_uid, p_email, p_nickname)
+    on conflict (auth_uid) do nothing
+    returning id into v_user_id;
+
+    if v_user_id is null then
+        select id into v_user_id
+        from users
+        where auth_uid = p_auth_uid;
+    end if;
+
+    -- 2️⃣ user_stats (기본값 row)
+    insert into user_stats (user_id)
+    values (v_user_id)
+    on conflict (user_id) do nothing;
+
+    -- 3️⃣ 내부 BIGINT id
+    return v_user_id;
+end;
+$$;
+
+revoke execute on function public.provision_user(uuid, text, text) from public, anon, authenticated;
+grant execute on function public.provision_user(uuid, text, text) to service_role;
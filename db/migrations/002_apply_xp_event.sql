@@ -0,0 +1,124 @@
+-- 002_apply_xp_event.sql
+-- POST /stats/xp/increment 의 read-modify-write 를 한 번의 RPC 로 처리한다.
+-- user_stats row 를 FOR UPDATE 로 잠그기 때문에 동시에 들어온 요청도 XP 가 유실되지 않는다.
+--
+-- ⚠️ 규칙은 services/stats_service.py 와 동일하게 유지할 것
+--    (DAILY_XP_CAP, calculate_level, calc_streak, apply_xp_event)
+
+create or replace function public.calculate_level(p_xp int)
+returns int
+language sql
+immutable
+as $$
+    select greatest(1, least(10, floor(p_xp / 100.0)::int + 1));
+$$;
+
+
+create or replace function public.apply_xp_event(
+    p_user_id bigint,
+    p_source text,          -- action | mood | journal
+    p_amount int,
+    p_action_id bigint,
+    p_today date,           -- user local date
+    p_day_start timestamp,  -- user local day 시작 (UTC)
+    p_day_end timestamp     -- user local day 끝 (UTC)
+) returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    c_daily_xp_cap constant int := 150;
+    v_row user_stats%rowtype;
+    v_daily_xp int;
+    v_gained int;
+    v_xp int;
+    v_level int;
+    v_streak int;
+    v_blocked constant jsonb := jsonb_build_object('gained_xp', 0, 'blocked', true);
+begin
+    select * into v_row
+    from user_stats
+    where user_id = p_user_id
+    for update;
+
+    if not found then
+        raise exception 'user_stats not found for user %', p_user_id
+            using errcode = 'P0002';
+    end if;
+
+    -- ── SOURCE별 하루 1회 가드 ──────────────────
+    if p_source = 'action' then
+        if p_action_id is null then
+            return v_blocked;
+        end if;
+
+        perform 1
+        from action_logs
+        where user_id = p_user_id
+          and action_id = p_action_id
+          and completed_at between p_day_start and p_day_end
+        limit 1;
+
+        if found then
+            return v_blocked;
+        end if;
+    end if;
+
+    if p_source = 'mood' and v_row.daily_mood_xp_date = p_today then
+        return v_blocked;
+    end if;
+
+    if p_source = 'journal' and v_row.daily_journal_xp_date = p_today then
+        return v_blocked;
+    end if;
+
+    -- ── DAILY XP CAP ──────────────────────────
+    v_daily_xp := case when v_row.daily_xp_date = p_today then v_row.daily_xp else 0 end;
+    v_gained := least(p_amount, greatest(0, c_daily_xp_cap - v_daily_xp));
+
+    if v_gained = 0 then
+        return v_blocked;
+    end if;
+
+    v_xp := v_row.xp + v_gained;
+    v_level := calculate_level(v_xp);
+
+    -- ── STREAK ────────────────────────────────
+    v_streak := case
+        when v_row.last_checkin_date = p_today then v_row.streak_days
+        when v_row.last_checkin_date = p_today - 1 then v_row.streak_days + 1
+        else 1
+    end;
+
+    update user_stats set
+        xp = v_xp,
+        level = v_level,
+        daily_xp = v_daily_xp + v_gained,
+        daily_xp_date = p_today,
+        streak_days = v_streak,
+        last_checkin_date = p_today,
+        daily_mood_xp_date = case when p_source = 'mood' then p_today else daily_mood_xp_date end,
+        daily_journal_xp_date = case when p_source = 'journal' then p_today else daily_journal_xp_date end,
+        updated_at = now()
+    where user_id = p_user_id;
+
+    -- ── ACTION 완료 기록 ───────────────────────
+    if p_source = 'action' then
+        insert into action_logs (user_id, action_id, completed_at)
+        values (p_user_id, p_action_id, now() at time zone 'utc');
+    end if;
+
+    return jsonb_build_object(
+        'gained_xp', v_gained,
+        'total_xp', v_xp,
+        'level', v_level,
+        'streak_days', v_streak,
+        'daily_xp', v_daily_xp + v_gained,
+        'blocked', false
+    );
+end;
+$$;
+
+revoke execute on function public.apply_xp_event(bigint, text, int, bigint, date, timestamp, timestamp) from public, anon, authenticated;
+grant execute on function public.apply_xp_event(bigint, text, int, bigint, date, timestamp, timestamp) to service_role;
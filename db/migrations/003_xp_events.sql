@@ -0,0 +1,330 @@
+-- 003_xp_events.sql
+-- append-only XP 이벤트 ledger.
+--
+-- - "하루 1회" 가드 = unique (user_id, source, source_id, local_day) 에 대한 조건부 insert 1회
+--   (journals.created_at / action_logs.completed_at 범위 scan 제거, 재시도는 자동으로 멱등)
+-- - user_stats 는 ledger 의 live snapshot (apply_xp_event 가 같은 트랜잭션에서 갱신)
+-- - xp_event_snapshots 는 compaction 으로 접힌 과거 구간
+-- - rebuild_user_stats() : 규칙 변경 후 snapshot + ledger 로 user_stats 일괄 재계산
+-- - compact_xp_events()  : 오래된 이벤트를 snapshot 으로 접고 삭제 (주기 실행)
+--
+-- source / source_id
+--   action        : action_id
+--   mood          : 0
+--   journal       : 0   (journal_entries + /stats/xp/increment?source=journal 공용)
+--   daily_journal : 0   (POST /journals 하루 1회)
+
+create table if not exists public.xp_events (
+    id bigserial primary key,
+    user_id bigint not null references public.users (id) on delete cascade,
+    source text not null,
+    source_id bigint not null default 0,
+    local_day date not null,
+    amount int not null,        -- 요청 XP (cap 적용 전, rebuild 에서 사용)
+    gained int not null,        -- 실제 적립 XP
+    created_at timestamptz not null default now(),
+    constraint xp_events_daily_guard unique (user_id, source, source_id, local_day)
+);
+
+create index if not exists xp_events_user_day_idx
+    on public.xp_events (user_id, local_day);
+
+
+create table if not exists public.xp_event_snapshots (
+    user_id bigint primary key references public.users (id) on delete cascade,
+    xp int not null default 0,
+    last_day date,
+    streak_days int not null default 0,
+    compacted_through date not null     -- 이 날짜 "이전" 이벤트가 접혀 있음
+);
+
+
+-- ── 기존 데이터 이관 ─────────────────────────────
+-- 현재 user_stats 를 opening snapshot 으로, 오늘 이미 받은 가드는 amount 0 이벤트로 옮긴다.
+insert into public.xp_event_snapshots (user_id, xp, last_day, streak_days, compacted_through)
+select user_id, xp, last_checkin_date, streak_days, current_date
+from public.user_stats
+on conflict (user_id) do nothing;
+
+insert into public.xp_events (user_id, source, source_id, local_day, amount, gained)
+select user_id, 'mood', 0, daily_mood_xp_date, 0, 0
+from public.user_stats
+where daily_mood_xp_date = current_date
+on conflict do nothing;
+
+insert into public.xp_events (user_id, source, source_id, local_day, amount, gained)
+select user_id, 'journal', 0, daily_journal_xp_date, 0, 0
+from public.user_stats
+where daily_journal_xp_date = current_date
+on conflict do nothing;
+
+insert into public.xp_events (user_id, source, source_id, local_day, amount, gained)
+select distinct user_id, 'action', action_id, current_date, 0, 0
+from public.action_logs
+where completed_at >= current_date
+on conflict do nothing;
+
+insert into public.xp_events (user_id, source, source_id, local_day, amount, gained)
+select distinct user_id, 'daily_journal', 0, current_date, 0, 0
+from public.journals
+where created_at >= current_date
+on conflict do nothing;
+
+
+-- ── apply_xp_event (ledger 버전) ─────────────────
+drop function if exists public.apply_xp_event(bigint, text, int, bigint, date, timestamp, timestamp);
+
+create or replace function public.apply_xp_event(
+    p_user_id bigint,
+    p_source text,
+    p_amount int,
+    p_source_id bigint,     -- action_id (action), 그 외 0
+    p_local_day date
+) returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    c_daily_xp_cap constant int := 150;
+    v_row user_stats%rowtype;
+    v_daily_xp int;
+    v_gained int;
+    v_event_id bigint;
+    v_duplicate boolean;
+    v_xp int;
+    v_level int;
+    v_streak int;
+begin
+    select * into v_row
+    from user_stats
+    where user_id = p_user_id
+    for update;
+
+    if not found then
+        raise exception 'user_stats not found for user %', p_user_id
+            using errcode = 'P0002';
+    end if;
+
+    -- ── DAILY XP CAP ──────────────────────────
+    v_daily_xp := case when v_row.daily_xp_date = p_local_day then v_row.daily_xp else 0 end;
+    v_gained := least(p_amount, greatest(0, c_daily_xp_cap - v_daily_xp));
+
+    -- ── 하루 1회 가드 = 조건부 insert ──────────
+    -- cap 에 걸려 적립이 없으면 가드 row 를 넣지 않는다 (그 source 의 하루 1회 slot 을 쓰지 않음)
+    -- 단 daily_journal 은 POST /journals 저장 가드이므로 cap 이어도 slot 을 쓴다
+    if v_gained > 0 or p_source = 'daily_journal' then
+        insert into xp_events (user_id, source, source_id, local_day, amount, gained)
+        values (p_user_id, p_source, coalesce(p_source_id, 0), p_local_day, p_amount, v_gained)
+        on conflict on constraint xp_events_daily_guard do nothing
+        returning id into v_event_id;
+        v_duplicate := v_event_id is null;
+    else
+        v_duplicate := exists (
+            select 1 from xp_events
+            where user_id = p_user_id and source = p_source
+              and source_id = coalesce(p_source_id, 0) and local_day = p_local_day
+        );
+    end if;
+
+    if v_duplicate or v_gained = 0 then
+        return jsonb_build_object(
+            'gained_xp', 0,
+            'blocked', true,
+            'reason', case when v_duplicate then 'duplicate' else 'daily_cap' end,
+            'total_xp', v_row.xp,
+            'level', v_row.level,
+            'streak_days', v_row.streak_days,
+            'daily_xp', v_daily_xp
+        );
+    end if;
+
+    v_xp := v_row.xp + v_gained;
+    v_level := calculate_level(v_xp);
+
+    -- ── STREAK ────────────────────────────────
+    v_streak := case
+        when v_row.last_checkin_date = p_local_day then v_row.streak_days
+        when v_row.last_checkin_date = p_local_day - 1 then v_row.streak_days + 1
+        else 1
+    end;
+
+    update user_stats set
+        xp = v_xp,
+        level = v_level,
+        daily_xp = v_daily_xp + v_gained,
+        daily_xp_date = p_local_day,
+        streak_days = v_streak,
+        last_checkin_date = p_local_day,
+        daily_mood_xp_date = case when p_source = 'mood' then p_local_day else daily_mood_xp_date end,
+        daily_journal_xp_date = case when p_source = 'journal' then p_local_day else daily_journal_xp_date end,
+        updated_at = now()
+    where user_id = p_user_id;
+
+    -- ── ACTION 완료 기록 ───────────────────────
+    if p_source = 'action' then
+        insert into action_logs (user_id, action_id, completed_at)
+        values (p_user_id, p_source_id, now() at time zone 'utc');
+    end if;
+
+    return jsonb_build_object(
+        'gained_xp', v_gained,
+        'total_xp', v_xp,
+        'level', v_level,
+        'streak_days', v_streak,
+        'daily_xp', v_daily_xp + v_gained,
+        'blocked', false
+    );
+end;
+$$;
+
+
+-- ── snapshot + ledger 집계 ───────────────────────
+-- p_before 이전(<) 이벤트까지 반영한 사용자별 XP 상태.
+-- 하루 XP = least(cap, sum(amount)) : 이벤트를 순서대로 cap 적용한 결과와 같다.
+create or replace function public.xp_ledger_totals(
+    p_user_ids bigint[],
+    p_before date
+) returns table (
+    user_id bigint,
+    xp int,
+    last_day date,
+    streak_days int,
+    daily_xp int,
+    mood_day date,
+    journal_day date
+)
+language sql
+stable
+set search_path = public
+as $$
+    with ev as (
+        select e.user_id, e.source, e.local_day, e.amount
+        from xp_events e
+        left join xp_event_snapshots s on s.user_id = e.user_id
+        where (p_user_ids is null or e.user_id = any (p_user_ids))
+          and e.local_day < p_before
+          and (s.compacted_through is null or e.local_day >= s.compacted_through)
+    ),
+    days as (
+        select ev.user_id, ev.local_day, least(150, sum(ev.amount))::int as day_xp
+        from ev
+        group by ev.user_id, ev.local_day
+        having sum(ev.amount) > 0
+    ),
+    islands as (
+        select d.user_id, d.local_day,
+               d.local_day - (row_number() over (partition by d.user_id order by d.local_day))::int as grp
+        from days d
+    ),
+    last_island as (
+        select i.user_id, count(*)::int as len, min(i.local_day) as first_day
+        from islands i
+        where i.grp = (select max(i2.grp) from islands i2 where i2.user_id = i.user_id)
+        group by i.user_id
+    ),
+    agg as (
+        select d.user_id, sum(d.day_xp)::int as xp, max(d.local_day) as last_day
+        from days d
+        group by d.user_id
+    ),
+    src as (
+        select ev.user_id,
+               max(ev.local_day) filter (where ev.source = 'mood' and ev.amount > 0) as mood_day,
+               max(ev.local_day) filter (where ev.source = 'journal' and ev.amount > 0) as journal_day
+        from ev
+        group by ev.user_id
+    )
+    select
+        us.user_id,
+        coalesce(s.xp, 0) + coalesce(a.xp, 0),
+        coalesce(a.last_day, s.last_day),
+        case
+            when a.user_id is null then coalesce(s.streak_days, 0)
+            when s.last_day is not null and t.first_day = s.last_day then t.len + s.streak_days - 1
+            when s.last_day is not null and t.first_day = s.last_day + 1 then t.len + s.streak_days
+            else t.len
+        end,
+        ld.day_xp,
+        src.mood_day,
+        src.journal_day
+    from user_stats us
+    left join xp_event_snapshots s on s.user_id = us.user_id
+    left join agg a on a.user_id = us.user_id
+    left join last_island t on t.user_id = us.user_id
+    left join days ld on ld.user_id = us.user_id and ld.local_day = a.last_day
+    left join src on src.user_id = us.user_id
+    where p_user_ids is null or us.user_id = any (p_user_ids);
+$$;
+
+
+-- 규칙 변경 후 user_stats 재계산 (p_user_ids null = 전체)
+create or replace function public.rebuild_user_stats(
+    p_user_ids bigint[] default null
+) returns int
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_count int;
+begin
+    update user_stats us set
+        xp = t.xp,
+        level = calculate_level(t.xp),
+        streak_days = t.streak_days,
+        last_checkin_date = t.last_day,
+        daily_xp = coalesce(t.daily_xp, us.daily_xp),
+        daily_xp_date = case when t.daily_xp is null then us.daily_xp_date else t.last_day end,
+        daily_mood_xp_date = coalesce(t.mood_day, us.daily_mood_xp_date),
+        daily_journal_xp_date = coalesce(t.journal_day, us.daily_journal_xp_date),
+        updated_at = now()
+    from xp_ledger_totals(p_user_ids, 'infinity'::date) t
+    where us.user_id = t.user_id;
+
+    get diagnostics v_count = row_count;
+    return v_count;
+end;
+$$;
+
+
+-- p_before 이전 이벤트를 snapshot 으로 접고 ledger 에서 삭제
+-- (최근 이틀은 가드로 써야 하므로 접지 않는다)
+create or replace function public.compact_xp_events(
+    p_before date
+) returns int
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_count int;
+begin
+    if p_before > current_date - 2 then
+        raise exception 'compact_xp_events: p_before must be <= current_date - 2';
+    end if;
+
+    insert into xp_event_snapshots (user_id, xp, last_day, streak_days, compacted_through)
+    select t.user_id, t.xp, t.last_day, t.streak_days, p_before
+    from xp_ledger_totals(null, p_before) t
+    on conflict (user_id) do update set
+        xp = excluded.xp,
+        last_day = excluded.last_day,
+        streak_days = excluded.streak_days,
+        compacted_through = excluded.compacted_through
+    where xp_event_snapshots.compacted_through < excluded.compacted_through;
+
+    delete from xp_events where local_day < p_before;
+
+    get diagnostics v_count = row_count;
+    return v_count;
+end;
+$$;
+
+
+revoke execute on function public.apply_xp_event(bigint, text, int, bigint, date) from public, anon, authenticated;
+revoke execute on function public.rebuild_user_stats(bigint[]) from public, anon, authenticated;
+revoke execute on function public.compact_xp_events(date) from public, anon, authenticated;
+grant execute on function public.apply_xp_event(bigint, text, int, bigint, date) to service_role;
+grant execute on function public.rebuild_user_stats(bigint[]) to service_role;
+grant execute on function public.compact_xp_events(date) to service_role;
@@ -0,0 +1,53 @@
+-- 005_submit_mood.sql
+-- POST /mood/submit : tag code 검증 → moods insert → mood_emotion_tags insert 를
+-- 하나의 트랜잭션(RPC 1회)으로 처리한다. 모르는 code 가 있으면 아무것도 쓰지 않는다.
+--
+-- 모르는 code: SQLSTATE 22023 (invalid_parameter_value), detail = 쉼표로 이은 code 목록
+
+create or replace function public.submit_mood(
+    p_user_id bigint,
+    p_date date,
+    p_recorded_at timestamptz,
+    p_main_valence int,
+    p_energy int,
+    p_trigger_type text,
+    p_note text,
+    p_tag_codes text[]
+) returns bigint
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_codes text[] := coalesce(p_tag_codes, '{}');
+    v_missing text[];
+    v_mood_id bigint;
+begin
+    -- 1️⃣ tag code 검증 (쓰기 전에)
+    select array_agg(c order by c) into v_missing
+    from unnest(v_codes) as c
+    where not exists (select 1 from emotion_tags t where t.code = c);
+
+    if v_missing is not null then
+        raise exception 'Unknown tag codes'
+            using errcode = '22023',
+                  detail = array_to_string(v_missing, ',');
+    end if;
+
+    -- 2️⃣ mood
+    insert into moods (user_id, date, recorded_at, main_valence, energy, trigger_type, note)
+    values (p_user_id, p_date, p_recorded_at, p_main_valence, p_energy, p_trigger_type, p_note)
+    returning id into v_mood_id;
+
+    -- 3️⃣ tags
+    insert into mood_emotion_tags (mood_id, tag_id)
+    select v_mood_id, t.id
+    from emotion_tags t
+    where t.code = any (v_codes);
+
+    return v_mood_id;
+end;
+$$;
+
+revoke execute on function public.submit_mood(bigint, date, timestamptz, int, int, text, text, text[]) from public, anon, authenticated;
+grant execute on function public.submit_mood(bigint, date, timestamptz, int, int, text, text, text[]) to service_role;
@@ -0,0 +1,196 @@
+-- 006_mood_daily_rollups.sql
+-- 사용자별 / 날짜별 mood 집계. submit_mood 가 같은 트랜잭션에서 증분 갱신한다.
+-- GET /mood/analysis (7d / 30d) 는 raw moods 대신 이 테이블의 최대 30 row 만 읽는다.
+--
+-- 기존 데이터: select backfill_mood_daily_rollups();   (또는 scripts/backfill_mood_rollups.py)
+
+create table if not exists public.mood_daily_rollups (
+    user_id bigint not null references public.users (id) on delete cascade,
+    date date not null,
+    mood_count int not null default 0,
+    valence_sum int not null default 0,
+    energy_sum int not null default 0,
+    -- 그날 마지막 mood (recorded_at 기준)
+    last_mood_id bigint,
+    last_recorded_at timestamptz,
+    last_valence int,
+    last_energy int,
+    last_note text,
+    last_trigger_type text,
+    -- {"calm": 3, "happy": 1}
+    tag_counts jsonb not null default '{}'::jsonb,
+    updated_at timestamptz not null default now(),
+    primary key (user_id, date)
+);
+
+
+create or replace function public.jsonb_sum_counts(a jsonb, b jsonb)
+returns jsonb
+language sql
+immutable
+as $$
+    select coalesce(jsonb_object_agg(key, total), '{}'::jsonb)
+    from (
+        select key, sum(value::int) as total
+        from (
+            select * from jsonb_each_text(coalesce(a, '{}'::jsonb))
+            union all
+            select * from jsonb_each_text(coalesce(b, '{}'::jsonb))
+        ) kv
+        group by key
+    ) s;
+$$;
+
+
+-- submit_mood + rollup 증분 갱신
+create or replace function public.submit_mood(
+    p_user_id bigint,
+    p_date date,
+    p_recorded_at timestamptz,
+    p_main_valence int,
+    p_energy int,
+    p_trigger_type text,
+    p_note text,
+    p_tag_codes text[]
+) returns bigint
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_codes text[] := coalesce(p_tag_codes, '{}');
+    v_missing text[];
+    v_mood_id bigint;
+    v_tag_counts jsonb;
+begin
+    -- 1️⃣ tag code 검증 (쓰기 전에)
+    select array_agg(c order by c) into v_missing
+    from unnest(v_codes) as c
+    where not exists (select 1 from emotion_tags t where t.code = c);
+
+    if v_missing is not null then
+        raise exception 'Unknown tag codes'
+            using errcode = '22023',
+                  detail = array_to_string(v_missing, ',');
+    end if;
+
+    -- 2️⃣ mood
+    insert into moods (user_id, date, recorded_at, main_valence, energy, trigger_type, note)
+    values (p_user_id, p_date, p_recorded_at, p_main_valence, p_energy, p_trigger_type, p_note)
+    returning id into v_mood_id;
+
+    -- 3️⃣ tags
+    with ins as (
+        insert into mood_emotion_tags (mood_id, tag_id)
+        select v_mood_id, t.id
+        from emotion_tags t
+        where t.code = any (v_codes)
+        returning tag_id
+    )
+    select coalesce(jsonb_object_agg(t.code, 1), '{}'::jsonb) into v_tag_counts
+    from ins
+    join emotion_tags t on t.id = ins.tag_id;
+
+    -- 4️⃣ daily rollup
+    insert into mood_daily_rollups as r (
+        user_id, date, mood_count, valence_sum, energy_sum,
+        last_mood_id, last_recorded_at, last_valence, last_energy, last_note, last_trigger_type,
+        tag_counts
+    )
+    values (
+        p_user_id, p_date, 1, p_main_valence, p_energy,
+        v_mood_id, p_recorded_at, p_main_valence, p_energy, p_note, p_trigger_type,
+        v_tag_counts
+    )
+    on conflict (user_id, date) do update set
+        mood_count = r.mood_count + 1,
+        valence_sum = r.valence_sum + excluded.valence_sum,
+        energy_sum = r.energy_sum + excluded.energy_sum,
+        last_mood_id = case when excluded.last_recorded_at >= r.last_recorded_at or r.last_recorded_at is null
+                            then excluded.last_mood_id else r.last_mood_id end,
+        last_valence = case when excluded.last_recorded_at >= r.last_recorded_at or r.last_recorded_at is null
+                            then excluded.last_valence else r.last_valence end,
+        last_energy = case when excluded.last_recorded_at >= r.last_recorded_at or r.last_recorded_at is null
+                           then excluded.last_energy else r.last_energy end,
+        last_note = case when excluded.last_recorded_at >= r.last_recorded_at or r.last_recorded_at is null
+                         then excluded.last_note else r.last_note end,
+        last_trigger_type = case when excluded.last_recorded_at >= r.last_recorded_at or r.last_recorded_at is null
+                                 then excluded.last_trigger_type else r.last_trigger_type end,
+        last_recorded_at = greatest(r.last_recorded_at, excluded.last_recorded_at),
+        tag_counts = jsonb_sum_counts(r.tag_counts, excluded.tag_counts),
+        updated_at = now();
+
+    return v_mood_id;
+end;
+$$;
+
+
+-- 기존 moods 로 rollup 재계산 (p_user_ids null = 전체)
+create or replace function public.backfill_mood_daily_rollups(
+    p_user_ids bigint[] default null
+) returns int
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_count int;
+begin
+    -- 대상 사용자 row lock: moods insert 의 FK 확인(FOR KEY SHARE)과 충돌하므로
+    -- 진행 중인 submit_mood 는 commit 될 때까지 기다리고 (→ 아래 재계산에 포함),
+    -- 새 submit_mood 는 이 트랜잭션이 끝난 뒤 재계산된 row 위에 증분 갱신한다
+    perform 1
+    from users
+    where p_user_ids is null or id = any (p_user_ids)
+    order by id
+    for update;
+
+    delete from mood_daily_rollups
+    where p_user_ids is null or user_id = any (p_user_ids);
+
+    insert into mood_daily_rollups (
+        user_id, date, mood_count, valence_sum, energy_sum,
+        last_mood_id, last_recorded_at, last_valence, last_energy, last_note, last_trigger_type,
+        tag_counts
+    )
+    with m as (
+        select *
+        from moods
+        where p_user_ids is null or user_id = any (p_user_ids)
+    ),
+    agg as (
+        select user_id, date, count(*)::int as mood_count,
+               sum(main_valence)::int as valence_sum, sum(energy)::int as energy_sum
+        from m
+        group by user_id, date
+    ),
+    last_mood as (
+        select distinct on (user_id, date) *
+        from m
+        order by user_id, date, recorded_at desc nulls last, id desc
+    ),
+    tags as (
+        select user_id, date, jsonb_object_agg(code, n) as tag_counts
+        from (
+            select m.user_id, m.date, t.code, count(*)::int as n
+            from m
+            join mood_emotion_tags mt on mt.mood_id = m.id
+            join emotion_tags t on t.id = mt.tag_id
+            group by m.user_id, m.date, t.code
+        ) x
+        group by user_id, date
+    )
+    select a.user_id, a.date, a.mood_count, a.valence_sum, a.energy_sum,
+           l.id, l.recorded_at, l.main_valence, l.energy, l.note, l.trigger_type,
+           coalesce(tg.tag_counts, '{}'::jsonb)
+    from agg a
+    join last_mood l on l.user_id = a.user_id and l.date = a.date
+    left join tags tg on tg.user_id = a.user_id and tg.date = a.date;
+
+    get diagnostics v_count = row_count;
+    return v_count;
+end;
+$$;
+
+revoke execute on function public.backfill_mood_daily_rollups(bigint[]) from public, anon, authenticated;
+grant execute on function public.backfill_mood_daily_rollups(bigint[]) to service_role;
@@ -0,0 +1,65 @@
+-- 007_user_data_versions.sql
+-- 사용자별 / 도메인별 쓰기 카운터. 조건부 GET(ETag / If-None-Match) 의 version 으로 쓴다.
+-- trigger 로 갱신되므로 RPC / buffer flush / 직접 write 모두 반영되고, worker 간에도 일관된다.
+--
+--   stats           ← user_stats (profile 에 보이는 컬럼만)
+--   moods           ← moods
+--   journal_entries ← journal_entries
+--   action_logs     ← action_logs
+
+create table if not exists public.user_data_versions (
+    user_id bigint primary key references public.users (id) on delete cascade,
+    stats bigint not null default 0,
+    moods bigint not null default 0,
+    journal_entries bigint not null default 0,
+    action_logs bigint not null default 0,
+    updated_at timestamptz not null default now()
+);
+
+
+-- trigger 인자: 올릴 version 컬럼명
+create or replace function public.bump_user_data_version()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_user_id bigint := case when tg_op = 'DELETE' then old.user_id else new.user_id end;
+begin
+    if v_user_id is null then
+        return null;
+    end if;
+
+    execute format(
+        'insert into user_data_versions as v (user_id, %1$I) values ($1, 1)
+         on conflict (user_id) do update set %1$I = v.%1$I + 1, updated_at = now()',
+        tg_argv[0]
+    ) using v_user_id;
+
+    return null;
+end;
+$$;
+
+
+drop trigger if exists user_stats_bump_version on public.user_stats;
+-- total_* 카운터(buffer flush)만 바뀌는 update 는 profile 응답과 무관하므로 제외
+create trigger user_stats_bump_version
+    after insert or delete or update of level, xp, streak_days, daily_xp, plan
+    on public.user_stats
+    for each row execute function public.bump_user_data_version('stats');
+
+drop trigger if exists moods_bump_version on public.moods;
+create trigger moods_bump_version
+    after insert or update or delete on public.moods
+    for each row execute function public.bump_user_data_version('moods');
+
+drop trigger if exists journal_entries_bump_version on public.journal_entries;
+create trigger journal_entries_bump_version
+    after insert or update or delete on public.journal_entries
+    for each row execute function public.bump_user_data_version('journal_entries');
+
+drop trigger if exists action_logs_bump_version on public.action_logs;
+create trigger action_logs_bump_version
+    after insert or update or delete on public.action_logs
+    for each row execute function public.bump_user_data_version('action_logs');
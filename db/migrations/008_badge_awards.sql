@@ -0,0 +1,54 @@
+-- 008_badge_awards.sql
+-- user_badges (user_id, badge_id) unique → 뱃지 지급을 upsert(ignore duplicates) 한 번으로.
+-- award_badges_bulk: 규칙(services/badge_service.py BADGE_RULES)을 전체 사용자에게 set 단위로 재평가.
+--
+--   select * from award_badges_bulk('[{"code": "streak_7", "stat": "streak_days", "threshold": 7}]');
+--   (또는 python -m scripts.backfill_badges)
+
+-- 1️⃣ 중복 지급 정리 (가장 먼저 insert 된 것만 남김)
+delete from public.user_badges ub
+using public.user_badges dup
+where ub.user_id = dup.user_id
+  and ub.badge_id = dup.badge_id
+  and ub.id > dup.id;
+
+create unique index if not exists user_badges_user_badge_key
+    on public.user_badges (user_id, badge_id);
+
+
+-- 2️⃣ 규칙 일괄 평가 + 지급 (p_user_ids null = 전체)
+-- p_rules: [{"code": "...", "stat": "<user_stats 컬럼>", "threshold": 5}, ...]
+create or replace function public.award_badges_bulk(
+    p_rules jsonb,
+    p_user_ids bigint[] default null
+) returns table (user_id bigint, badge_code text)
+language sql
+security definer
+set search_path = public
+as $$
+    with rules as (
+        select r.code, r.stat, r.threshold
+        from jsonb_to_recordset(p_rules) as r(code text, stat text, threshold int)
+    ),
+    qualified as (
+        select us.user_id, b.id as badge_id, b.code
+        from user_stats us
+        cross join rules r
+        join badges b on b.code = r.code
+        where (p_user_ids is null or us.user_id = any (p_user_ids))
+          and coalesce((to_jsonb(us) ->> r.stat)::int, 0) >= r.threshold
+    ),
+    ins as (
+        insert into user_badges as ub (user_id, badge_id, earned_at)
+        select q.user_id, q.badge_id, now()
+        from qualified q
+        on conflict (user_id, badge_id) do nothing
+        returning ub.user_id, ub.badge_id
+    )
+    select ins.user_id, q.code
+    from ins
+    join qualified q on q.user_id = ins.user_id and q.badge_id = ins.badge_id;
+$$;
+
+revoke execute on function public.award_badges_bulk(jsonb, bigint[]) from public, anon, authenticated;
+grant execute on function public.award_badges_bulk(jsonb, bigint[]) to service_role;
@@ -0,0 +1,305 @@
+-- 009_sync_events.sql
+-- 오프라인 동기화: POST /sync/batch → sync_events RPC 1회.
+--
+-- - sync_receipts: (user_id, client_id) 멱등 영수증. 재전송된 event 는 저장된 결과를 그대로 돌려준다
+-- - apply_xp_event: 늦게 도착한(과거 local_day) event 가 오늘 daily_xp / streak 를 되돌리지 않도록 보강
+--   + p_occurred_at (action_logs.completed_at 에 클라이언트 시각 기록)
+--   + p_total_journals (write_journal 의 카운터를 같은 user_stats update 에 싣는다)
+-- - sync_events: journal_entries bulk insert, mood / XP 는 시간순으로 한 번에 적용.
+--   과거 날짜 XP 가 섞였으면 끝에 rebuild_user_stats 로 streak 를 ledger 기준 재계산
+--   compaction 으로 접힌 날짜(xp_event_snapshots.compacted_through 이전)의 XP 는 적립하지 않는다
+--   (rebuild 가 그 구간 ledger 를 보지 않으므로 적립해도 지워진다)
+
+create table if not exists public.sync_receipts (
+    user_id bigint not null references public.users (id) on delete cascade,
+    client_id text not null,
+    result jsonb not null,
+    created_at timestamptz not null default now(),
+    primary key (user_id, client_id)
+);
+
+
+-- ── apply_xp_event (late event 대응) ─────────────
+drop function if exists public.apply_xp_event(bigint, text, int, bigint, date);
+
+create or replace function public.apply_xp_event(
+    p_user_id bigint,
+    p_source text,
+    p_amount int,
+    p_source_id bigint,     -- action_id (action), 그 외 0
+    p_local_day date,
+    p_occurred_at timestamptz default null,
+    p_total_journals int default 0      -- duplicate 가 아니면 total_journals 에 더함
+) returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    c_daily_xp_cap constant int := 150;
+    v_row user_stats%rowtype;
+    v_late boolean;
+    v_daily_xp int;
+    v_gained int;
+    v_event_id bigint;
+    v_duplicate boolean;
+    v_xp int;
+    v_level int;
+    v_streak int;
+begin
+    select * into v_row
+    from user_stats
+    where user_id = p_user_id
+    for update;
+
+    if not found then
+        raise exception 'user_stats not found for user %', p_user_id
+            using errcode = 'P0002';
+    end if;
+
+    -- 마지막 체크인보다 과거 날짜 = 오프라인 동기화로 늦게 도착한 event
+    v_late := p_local_day < v_row.last_checkin_date;
+
+    -- ── DAILY XP CAP ──────────────────────────
+    v_daily_xp := case
+        when v_row.daily_xp_date = p_local_day then v_row.daily_xp
+        when v_late then coalesce((
+            select sum(gained)::int from xp_events
+            where user_id = p_user_id and local_day = p_local_day
+        ), 0)
+        else 0
+    end;
+    v_gained := least(p_amount, greatest(0, c_daily_xp_cap - v_daily_xp));
+
+    -- ── 하루 1회 가드 = 조건부 insert ──────────
+    -- cap 에 걸려 적립이 없으면 가드 row 를 넣지 않는다 (그 source 의 하루 1회 slot 을 쓰지 않음)
+    -- 단 daily_journal 은 POST /journals 저장 가드이므로 cap 이어도 slot 을 쓴다
+    if v_gained > 0 or p_source = 'daily_journal' then
+        insert into xp_events (user_id, source, source_id, local_day, amount, gained)
+        values (p_user_id, p_source, coalesce(p_source_id, 0), p_local_day, p_amount, v_gained)
+        on conflict on constraint xp_events_daily_guard do nothing
+        returning id into v_event_id;
+        v_duplicate := v_event_id is null;
+    else
+        v_duplicate := exists (
+            select 1 from xp_events
+            where user_id = p_user_id and source = p_source
+              and source_id = coalesce(p_source_id, 0) and local_day = p_local_day
+        );
+    end if;
+
+    if v_duplicate or v_gained = 0 then
+        -- cap 으로 적립만 없는 경우: 카운터는 올린다 (이 경로의 유일한 user_stats write)
+        if not v_duplicate and p_total_journals <> 0 then
+            update user_stats set
+                total_journals = total_journals + p_total_journals,
+                updated_at = now()
+            where user_id = p_user_id;
+        end if;
+
+        return jsonb_build_object(
+            'gained_xp', 0,
+            'blocked', true,
+            'reason', case when v_duplicate then 'duplicate' else 'daily_cap' end,
+            'total_xp', v_row.xp,
+            'level', v_row.level,
+            'streak_days', v_row.streak_days,
+            'daily_xp', v_daily_xp
+        );
+    end if;
+
+    v_xp := v_row.xp + v_gained;
+    v_level := calculate_level(v_xp);
+
+    -- ── STREAK (late event 는 그대로, 필요하면 호출자가 rebuild) ──
+    v_streak := case
+        when v_late then v_row.streak_days
+        when v_row.last_checkin_date = p_local_day then v_row.streak_days
+        when v_row.last_checkin_date = p_local_day - 1 then v_row.streak_days + 1
+        else 1
+    end;
+
+    update user_stats set
+        xp = v_xp,
+        level = v_level,
+        daily_xp = case when v_late then daily_xp else v_daily_xp + v_gained end,
+        daily_xp_date = case when v_late then daily_xp_date else p_local_day end,
+        streak_days = v_streak,
+        last_checkin_date = greatest(last_checkin_date, p_local_day),
+        daily_mood_xp_date = case when p_source = 'mood'
+                                  then greatest(daily_mood_xp_date, p_local_day) else daily_mood_xp_date end,
+        daily_journal_xp_date = case when p_source = 'journal'
+                                     then greatest(daily_journal_xp_date, p_local_day) else daily_journal_xp_date end,
+        total_journals = total_journals + p_total_journals,
+        updated_at = now()
+    where user_id = p_user_id;
+
+    -- ── ACTION 완료 기록 ───────────────────────
+    if p_source = 'action' then
+        insert into action_logs (user_id, action_id, completed_at)
+        values (p_user_id, p_source_id, coalesce(p_occurred_at, now()) at time zone 'utc');
+    end if;
+
+    return jsonb_build_object(
+        'gained_xp', v_gained,
+        'total_xp', v_xp,
+        'level', v_level,
+        'streak_days', v_streak,
+        'daily_xp', v_daily_xp + v_gained,
+        'blocked', false
+    );
+end;
+$$;
+
+revoke execute on function public.apply_xp_event(bigint, text, int, bigint, date, timestamptz, int) from public, anon, authenticated;
+grant execute on function public.apply_xp_event(bigint, text, int, bigint, date, timestamptz, int) to service_role;
+
+
+-- ── sync_events ──────────────────────────────────
+-- p_events: services/sync_service.py 가 검증 / 시간순 정렬한 event 배열
+--   공통:          client_id, type, recorded_at (UTC), local_day
+--   mood:          date, main_valence, energy, trigger_type, note, tag_codes
+--   journal_entry: date, content, entry_type
+--   xp:            source, amount, source_id
+-- returns: {"results": {client_id: result}, "stats": user_stats 요약}
+create or replace function public.sync_events(
+    p_user_id bigint,
+    p_events jsonb
+) returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_last_checkin date;
+    v_compacted_through date;
+    v_late boolean := false;
+    v_known jsonb;
+    v_results jsonb := '{}'::jsonb;
+    v_event jsonb;
+    v_result jsonb;
+    v_mood_id bigint;
+    v_detail text;
+begin
+    -- 0️⃣ 사용자 단위 직렬화: 같은 batch 재전송이 겹쳐도 receipt 확인 → 저장이 한 번에 하나씩
+    --    (apply_xp_event 와 같은 user_stats row lock, 먼저 끝난 쪽의 영수증을 1️⃣ 에서 보게 된다)
+    select last_checkin_date into v_last_checkin
+    from user_stats
+    where user_id = p_user_id
+    for update;
+
+    if not found then
+        raise exception 'user_stats not found for user %', p_user_id
+            using errcode = 'P0002';
+    end if;
+
+    select compacted_through into v_compacted_through
+    from xp_event_snapshots
+    where user_id = p_user_id;
+
+    -- 1️⃣ 이미 처리된 client_id (재전송)
+    select coalesce(jsonb_object_agg(r.client_id, r.result || '{"status": "duplicate"}'::jsonb), '{}'::jsonb)
+    into v_known
+    from sync_receipts r
+    where r.user_id = p_user_id
+      and r.client_id in (select e ->> 'client_id' from jsonb_array_elements(p_events) e);
+
+    -- 2️⃣ journal entries: statement 1번
+    insert into journal_entries (user_id, content, date, type, created_at)
+    select p_user_id, e ->> 'content', (e ->> 'date')::date, e ->> 'entry_type',
+           (e ->> 'recorded_at')::timestamptz at time zone 'utc'
+    from jsonb_array_elements(p_events) e
+    where e ->> 'type' = 'journal_entry'
+      and not v_known ? (e ->> 'client_id');
+
+    -- 3️⃣ mood / XP: 시간순 (배열 순서)
+    for v_event in
+        select e from jsonb_array_elements(p_events) with ordinality as t(e, n) order by n
+    loop
+        continue when v_known ? (v_event ->> 'client_id');
+
+        if v_event ->> 'type' = 'mood' then
+            begin
+                v_mood_id := submit_mood(
+                    p_user_id,
+                    (v_event ->> 'date')::date,
+                    (v_event ->> 'recorded_at')::timestamptz,
+                    (v_event ->> 'main_valence')::int,
+                    (v_event ->> 'energy')::int,
+                    v_event ->> 'trigger_type',
+                    v_event ->> 'note',
+                    array(select jsonb_array_elements_text(coalesce(v_event -> 'tag_codes', '[]'::jsonb)))
+                );
+                v_result := jsonb_build_object('status', 'ok', 'mood_id', v_mood_id);
+            exception when sqlstate '22023' then
+                get stacked diagnostics v_detail = pg_exception_detail;
+                v_result := jsonb_build_object(
+                    'status', 'rejected',
+                    'reason', 'unknown_tag_codes',
+                    'missing', to_jsonb(string_to_array(v_detail, ','))
+                );
+            end;
+
+        elsif (v_event ->> 'local_day')::date < v_compacted_through then
+            -- 접힌 구간: journal entry 는 2️⃣ 에서 저장됨, XP 만 없음 / xp event 는 거절
+            v_result := case
+                when v_event ->> 'type' = 'journal_entry' then jsonb_build_object(
+                    'status', 'ok',
+                    'xp', jsonb_build_object('gained_xp', 0, 'blocked', true, 'reason', 'too_old')
+                )
+                else jsonb_build_object('status', 'rejected', 'reason', 'too_old')
+            end;
+
+        elsif v_event ->> 'type' = 'journal_entry' then
+            v_result := jsonb_build_object('status', 'ok', 'xp', apply_xp_event(
+                p_user_id, 'journal', 10, 0,
+                (v_event ->> 'local_day')::date,
+                (v_event ->> 'recorded_at')::timestamptz
+            ));
+
+        else
+            v_result := jsonb_build_object('status', 'ok', 'xp', apply_xp_event(
+                p_user_id,
+                v_event ->> 'source',
+                (v_event ->> 'amount')::int,
+                coalesce((v_event ->> 'source_id')::bigint, 0),
+                (v_event ->> 'local_day')::date,
+                (v_event ->> 'recorded_at')::timestamptz
+            ));
+        end if;
+
+        if v_event ->> 'type' <> 'mood'
+           and (v_event ->> 'local_day')::date < v_last_checkin
+           and (v_compacted_through is null or (v_event ->> 'local_day')::date >= v_compacted_through) then
+            v_late := true;
+        end if;
+
+        v_results := v_results || jsonb_build_object(v_event ->> 'client_id', v_result);
+    end loop;
+
+    -- 4️⃣ 영수증 (statement 1번)
+    insert into sync_receipts (user_id, client_id, result)
+    select p_user_id, key, value
+    from jsonb_each(v_results)
+    on conflict do nothing;
+
+    -- 5️⃣ 과거 날짜 XP 가 들어왔으면 streak / daily 를 ledger 기준으로 재계산
+    if v_late then
+        perform rebuild_user_stats(array[p_user_id]);
+    end if;
+
+    return jsonb_build_object(
+        'results', v_known || v_results,
+        'stats', (
+            select jsonb_build_object(
+                'level', level, 'xp', xp, 'streak_days', streak_days, 'daily_xp', daily_xp
+            )
+            from user_stats
+            where user_id = p_user_id
+        )
+    );
+end;
+$$;
+
+revoke execute on function public.sync_events(bigint, jsonb) from public, anon, authenticated;
+grant execute on function public.sync_events(bigint, jsonb) to service_role;
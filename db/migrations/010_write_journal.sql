@@ -0,0 +1,52 @@
+-- 010_write_journal.sql
+-- POST /journals, POST /journal-entries 공용 write 경로: 저장 + XP / level / streak 를 트랜잭션 1번에.
+--
+-- p_kind
+--   journal : journals insert, 하루 1회 (daily_journal 가드에 걸리면 저장하지 않음), total_journals +1
+--   entry   : journal_entries insert, XP 는 journal 가드 (하루 1회 적립, 저장은 항상)
+
+create or replace function public.write_journal(
+    p_user_id bigint,
+    p_kind text,
+    p_content text,
+    p_local_day date,
+    p_entry_date date default null,
+    p_entry_type text default null
+) returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_xp jsonb;
+    v_id bigint;
+begin
+    if p_kind = 'journal' then
+        -- 1️⃣ 하루 1회 가드 + XP + total_journals (user_stats update 1번)
+        v_xp := apply_xp_event(p_user_id, 'daily_journal', 10, 0, p_local_day, p_total_journals => 1);
+        if v_xp ->> 'reason' = 'duplicate' then
+            return jsonb_build_object('ok', false, 'blocked', true, 'xp', v_xp);
+        end if;
+
+        -- 2️⃣ 저장 (apply_xp_event 가 잡은 row lock 안에서)
+        insert into journals (user_id, content, created_at)
+        values (p_user_id, p_content, now() at time zone 'utc')
+        returning id into v_id;
+
+    elsif p_kind = 'entry' then
+        insert into journal_entries (user_id, content, date, type, created_at)
+        values (p_user_id, p_content, p_entry_date, p_entry_type, now() at time zone 'utc')
+        returning id into v_id;
+
+        v_xp := apply_xp_event(p_user_id, 'journal', 10, 0, p_local_day);
+
+    else
+        raise exception 'unknown journal kind %', p_kind using errcode = '22023';
+    end if;
+
+    return jsonb_build_object('ok', true, 'blocked', false, 'id', v_id, 'xp', v_xp);
+end;
+$$;
+
+revoke execute on function public.write_journal(bigint, text, text, date, date, text) from public, anon, authenticated;
+grant execute on function public.write_journal(bigint, text, text, date, date, text) to service_role;
@@ -0,0 +1,12 @@
+-- 011_history_indexes.sql
+-- history 목록 keyset pagination (services/history_service.py) 용 index.
+-- 정렬 key 와 같은 순서라서 몇 번째 페이지든 index range scan 한 번.
+
+create index if not exists journal_entries_user_history_idx
+    on public.journal_entries (user_id, date desc, created_at desc, id desc);
+
+create index if not exists journals_user_history_idx
+    on public.journals (user_id, created_at desc, id desc);
+
+create index if not exists moods_user_history_idx
+    on public.moods (user_id, date desc, created_at desc, id desc);
@@ -0,0 +1,184 @@
+-- 012_user_activity_months.sql
+-- 사용자별 / 월별 활동 달력 index. 하루 = 1 bit (bit 0 = 1일).
+--
+--   mood_days    ← moods.date
+--   journal_days ← journal_entries.date
+--   action_days  ← action_logs (completed_at, 없으면 started_at 의 UTC 날짜)
+--
+-- write 시 trigger 로 갱신 (insert = bit on, delete / 날짜 변경 = 그날 row 가 남았는지 다시 확인).
+-- 기존 데이터는 이 migration 끝에서 한 번 채운다 (다시 계산: select backfill_user_activity_months();
+-- 또는 scripts/backfill_activity_months.py)
+
+create table if not exists public.user_activity_months (
+    user_id bigint not null references public.users (id) on delete cascade,
+    month date not null,                        -- 그 달 1일
+    mood_days int not null default 0,
+    journal_days int not null default 0,
+    action_days int not null default 0,
+    updated_at timestamptz not null default now(),
+    primary key (user_id, month)
+);
+
+
+-- p_kind: mood | journal | action
+create or replace function public.set_activity_day(
+    p_user_id bigint,
+    p_day date,
+    p_kind text,
+    p_on boolean
+) returns void
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_month date := date_trunc('month', p_day)::date;
+    v_bit int := 1 << (extract(day from p_day)::int - 1);
+    v_column text := p_kind || '_days';
+begin
+    if p_user_id is null or p_day is null then
+        return;
+    end if;
+
+    if p_on then
+        execute format(
+            'insert into user_activity_months as m (user_id, month, %1$I) values ($1, $2, $3)
+             on conflict (user_id, month) do update set %1$I = m.%1$I | $3, updated_at = now()
+             where m.%1$I & $3 = 0',
+            v_column
+        ) using p_user_id, v_month, v_bit;
+    else
+        execute format(
+            'update user_activity_months set %1$I = %1$I & ~$3, updated_at = now()
+             where user_id = $1 and month = $2',
+            v_column
+        ) using p_user_id, v_month, v_bit;
+    end if;
+end;
+$$;
+
+
+create or replace function public.track_activity_day()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_kind text := tg_argv[0];
+    v_new_day date;
+    v_old_day date;
+    v_still boolean;
+begin
+    if tg_op in ('INSERT', 'UPDATE') then
+        if v_kind = 'action' then
+            v_new_day := (coalesce(new.completed_at, new.started_at))::date;
+        else
+            v_new_day := new.date;
+        end if;
+    end if;
+    if tg_op in ('UPDATE', 'DELETE') then
+        if v_kind = 'action' then
+            v_old_day := (coalesce(old.completed_at, old.started_at))::date;
+        else
+            v_old_day := old.date;
+        end if;
+    end if;
+
+    if v_new_day is not null and v_new_day is distinct from v_old_day then
+        perform set_activity_day(new.user_id, v_new_day, v_kind, true);
+    end if;
+
+    -- 삭제 / 날짜 변경: 그날 다른 row 가 없을 때만 bit off
+    if v_old_day is not null and v_old_day is distinct from v_new_day then
+        -- 월 row 를 먼저 lock: 같은 날 동시 insert (set_activity_day 의 on conflict 도 이 row 를 lock)
+        -- 가 commit 된 뒤에 exists 를 보게 되어, 남아 있어야 할 bit 를 지우지 않는다
+        perform 1
+        from user_activity_months
+        where user_id = old.user_id
+          and month = date_trunc('month', v_old_day)::date
+        for update;
+
+        if v_kind = 'mood' then
+            select exists (select 1 from moods where user_id = old.user_id and date = v_old_day) into v_still;
+        elsif v_kind = 'journal' then
+            select exists (select 1 from journal_entries where user_id = old.user_id and date = v_old_day) into v_still;
+        else
+            select exists (
+                select 1 from action_logs
+                where user_id = old.user_id
+                  and (coalesce(completed_at, started_at))::date = v_old_day
+            ) into v_still;
+        end if;
+        if not v_still then
+            perform set_activity_day(old.user_id, v_old_day, v_kind, false);
+        end if;
+    end if;
+
+    return null;
+end;
+$$;
+
+drop trigger if exists moods_track_activity on public.moods;
+create trigger moods_track_activity
+    after insert or update of date or delete on public.moods
+    for each row execute function public.track_activity_day('mood');
+
+drop trigger if exists journal_entries_track_activity on public.journal_entries;
+create trigger journal_entries_track_activity
+    after insert or update of date or delete on public.journal_entries
+    for each row execute function public.track_activity_day('journal');
+
+drop trigger if exists action_logs_track_activity on public.action_logs;
+create trigger action_logs_track_activity
+    after insert or update of started_at, completed_at or delete on public.action_logs
+    for each row execute function public.track_activity_day('action');
+
+
+-- 기존 데이터로 재계산 (p_user_ids null = 전체)
+create or replace function public.backfill_user_activity_months(
+    p_user_ids bigint[] default null
+) returns int
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_count int;
+begin
+    delete from user_activity_months
+    where p_user_ids is null or user_id = any (p_user_ids);
+
+    insert into user_activity_months (user_id, month, mood_days, journal_days, action_days)
+    select user_id, month,
+           coalesce(bit_or(bit) filter (where kind = 'mood'), 0),
+           coalesce(bit_or(bit) filter (where kind = 'journal'), 0),
+           coalesce(bit_or(bit) filter (where kind = 'action'), 0)
+    from (
+        select distinct user_id, kind,
+               date_trunc('month', day)::date as month,
+               1 << (extract(day from day)::int - 1) as bit
+        from (
+            select user_id, 'mood' as kind, date as day from moods
+            union all
+            select user_id, 'journal', date from journal_entries
+            union all
+            select user_id, 'action', (coalesce(completed_at, started_at))::date from action_logs
+        ) a
+        where day is not null
+          and (p_user_ids is null or user_id = any (p_user_ids))
+    ) d
+    group by user_id, month;
+
+    get diagnostics v_count = row_count;
+    return v_count;
+end;
+$$;
+
+revoke execute on function public.backfill_user_activity_months(bigint[]) from public, anon, authenticated;
+grant execute on function public.backfill_user_activity_months(bigint[]) to service_role;
+revoke execute on function public.set_activity_day(bigint, date, text, boolean) from public, anon, authenticated;
+
+
+-- 기존 데이터 채우기 (trigger 생성 이후, 같은 migration 안에서)
+select public.backfill_user_activity_months();
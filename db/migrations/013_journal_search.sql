@@ -0,0 +1,91 @@
+-- 013_journal_search.sql
+-- journals / journal_entries 본문 검색 (GET /search/journals).
+--
+-- 한국어는 형태소 분리 없이도 부분 문자열로 찾을 수 있어야 해서 tsvector 대신 pg_trgm 을 쓴다.
+-- (user_id, content) 복합 GIN index (btree_gin) → 사용자 범위 안에서만 index 조회.
+-- 3글자 미만 검색어는 trigram 이 없어 그 사용자의 index entry 를 훑지만, user_id 로 좁혀진 범위다.
+
+create extension if not exists pg_trgm;
+create extension if not exists btree_gin;
+
+create index if not exists journals_content_trgm_idx
+    on public.journals using gin (user_id, content gin_trgm_ops);
+
+create index if not exists journal_entries_content_trgm_idx
+    on public.journal_entries using gin (user_id, content gin_trgm_ops);
+
+
+-- p_query 를 공백으로 나눈 검색어가 모두 포함된 글 (대소문자 무시), 관련도 → 최신순 top-k
+-- p_sources: {journals, journal_entries} 중 일부 (null = 둘 다)
+create or replace function public.search_journals(
+    p_user_id bigint,
+    p_query text,
+    p_from date default null,
+    p_to date default null,
+    p_limit int default 20,
+    p_sources text[] default null
+) returns table (
+    source text,
+    id bigint,
+    date date,
+    created_at timestamptz,
+    content text,
+    rank real
+)
+language plpgsql
+stable
+security definer
+set search_path = public
+as $$
+declare
+    v_patterns text[];
+    v_head text;
+begin
+    -- 1️⃣ 검색어 → ilike pattern (LIKE 특수문자 escape), 긴 검색어 먼저
+    select array_agg(
+               '%' || replace(replace(replace(t, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+               order by length(t) desc
+           )
+    into v_patterns
+    from regexp_split_to_table(trim(coalesce(p_query, '')), '\s+') as t
+    where t <> '';
+
+    if v_patterns is null then
+        return;
+    end if;
+
+    -- 가장 긴 검색어 하나는 단독 조건으로 → trigram index 조건으로 쓰인다
+    v_head := v_patterns[1];
+
+    -- 2️⃣ 두 테이블에서 후보 → 관련도 순 top-k
+    return query
+    with hits as (
+        select 'journals'::text as source, j.id, j.created_at::date as date,
+               j.created_at::timestamptz as created_at, j.content
+        from journals j
+        where (p_sources is null or 'journals' = any (p_sources))
+          and j.user_id = p_user_id
+          and j.content ilike v_head
+          and j.content ilike all (v_patterns)
+          and (p_from is null or j.created_at >= p_from)
+          and (p_to is null or j.created_at < p_to + 1)
+        union all
+        select 'journal_entries'::text, e.id, e.date, e.created_at::timestamptz, e.content
+        from journal_entries e
+        where (p_sources is null or 'journal_entries' = any (p_sources))
+          and e.user_id = p_user_id
+          and e.content ilike v_head
+          and e.content ilike all (v_patterns)
+          and (p_from is null or e.date >= p_from)
+          and (p_to is null or e.date <= p_to)
+    )
+    select h.source, h.id, h.date, h.created_at, h.content,
+           word_similarity(p_query, h.content) as rank
+    from hits h
+    order by rank desc, h.date desc nulls last, h.created_at desc nulls last, h.id desc
+    limit least(greatest(coalesce(p_limit, 20), 1), 100);
+end;
+$$;
+
+revoke execute on function public.search_journals(bigint, text, date, date, int, text[]) from public, anon, authenticated;
+grant execute on function public.search_journals(bigint, text, date, date, int, text[]) to service_role;
@@ -1,19 +1,44 @@
 # weavemo-backend/dependencies/auth.py
+import hashlib
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 
 from config.settings import settings
+from core.ttl_cache import TTLCache
 from db.database import get_supabase
+from services.user_service import provision_user
 
 security = HTTPBearer()
 
+# 🔐 검증된 identity 캐시 (worker 단위)
+# - token hash → decoded payload (JWT exp 에 맞춰 만료)
+# - auth_uid → users.id (BIGINT)
+_token_cache = TTLCache(
+    maxsize=settings.IDENTITY_CACHE_MAX_TOKENS,
+    ttl=settings.IDENTITY_CACHE_TTL_SEC,
+)
+_user_id_cache = TTLCache(
+    maxsize=settings.IDENTITY_CACHE_MAX_USERS,
+    ttl=settings.IDENTITY_CACHE_TTL_SEC,
+)
 
-def get_current_user(
-    creds: HTTPAuthorizationCredentials = Depends(security),
-    supabase=Depends(get_supabase),
-):
-    token = creds.credentials
+
+def identity_cache_stats() -> dict:
+    return {
+        "tokens": _token_cache.stats(),
+        "user_ids": _user_id_cache.stats(),
+    }
+
+
+def _decode_token(token: str) -> dict:
+    # 원본 토큰 대신 digest(32 bytes)를 key로 보관
+    key = hashlib.sha256(token.encode()).digest()
+
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
 
     try:
         payload = jwt.decode(
@@ -28,6 +53,16 @@ def get_current_user(
             detail="Invalid or expired token",
         )
 
+    _token_cache.set(key, payload, expires_at=payload.get("exp"))
+    return payload
+
+
+async def get_current_user(
+    creds: HTTPAuthorizationCredentials = Depends(security),
+    supabase=Depends(get_supabase),
+):
+    payload = _decode_token(creds.credentials)
+
     auth_uid = payload.get("sub")
     email = payload.get("email")
 
@@ -37,33 +72,21 @@ def get_current_user(
             detail="Invalid token payload",
         )
 
-    # 1️⃣ users 테이블에서 auth_uid로 조회
-    res = (
-        supabase.table("users")
-        .select("id")
-        .eq("auth_uid", auth_uid)
-        .limit(1)
-        .execute()
-    )
-
-    rows = res.data or []
-
-    # 2️⃣ 없으면 자동 생성 (Week 3 기준 허용)
-    if rows:
-        user_id = rows[0]["id"]
-    else:
-        created = (
-            supabase.table("users")
-            .insert({
-                "auth_uid": auth_uid,
-                "email": email,
-                "nickname": email.split("@")[0] if email else "user",
-            })
-            .execute()
-        )
-        user_id = created.data[0]["id"]
+    # 0️⃣ 캐시 hit → DB 조회 없음
+    user_id = _user_id_cache.get(auth_uid)
+    if user_id is not None:
+        return {
+            "user_id": user_id,
+            "auth_uid": auth_uid,
+            "email": email,
+        }
+
+    # 1️⃣ users + user_stats get-or-create (RPC 1회)
+    user_id = await provision_user(supabase, auth_uid=auth_uid, email=email)
+
+    _user_id_cache.set(auth_uid, user_id)
 
-    # 3️⃣ 내부 user 객체 반환 (BIGINT id!)
+    # 2️⃣ 내부 user 객체 반환 (BIGINT id!)
     return {
         "user_id": user_id,   # ✅ DB에서 쓰는 ID
         "auth_uid": auth_uid, # 참고용
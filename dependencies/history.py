@@ -0,0 +1,77 @@
+# weavemo-backend/dependencies/history.py
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from services.history_service import HistorySpec, fetch_page, iter_rows
+from utils.pagination import parse_fields
+
+# format=json 한 페이지 최대 (더 크면 ndjson 으로 stream)
+MAX_JSON_PAGE = 100
+MAX_NDJSON_PAGE = 5000
+
+
+@dataclass
+class HistoryParams:
+    limit: int
+    cursor: Optional[str]
+    fields: Optional[str]
+    format: str
+
+
+async def history_params(
+    limit: int = Query(20, ge=1, le=MAX_NDJSON_PAGE),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="comma separated, e.g. id,date,content"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+) -> HistoryParams:
+    if format == "json" and limit > MAX_JSON_PAGE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit > {MAX_JSON_PAGE} requires format=ndjson",
+        )
+    return HistoryParams(limit=limit, cursor=cursor, fields=fields, format=format)
+
+
+async def history_response(supabase, spec: HistorySpec, *, user_id: int, params: HistoryParams):
+    """
+    format=json:   {"items": [...], "next_cursor": ...}
+    format=ndjson: row 당 한 줄, 마지막 줄 {"next_cursor": ...} (chunk 단위로 읽으며 바로 전송)
+    """
+    try:
+        columns = parse_fields(
+            params.fields,
+            allowed=spec.fields,
+            default=spec.default_fields,
+            required=spec.keys,
+        )
+        if params.format == "json":
+            return await fetch_page(
+                supabase, spec,
+                user_id=user_id, columns=columns, limit=params.limit, cursor=params.cursor,
+            )
+        rows = iter_rows(
+            supabase, spec,
+            user_id=user_id, columns=columns, limit=params.limit, cursor=params.cursor,
+        )
+        # 잘못된 cursor 는 stream 시작 전에 400 으로
+        first = await anext(rows, None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def stream():
+        count, last_cursor = 0, None
+        if first is not None:
+            row, last_cursor = first
+            count += 1
+            yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+            async for row, last_cursor in rows:
+                count += 1
+                yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+        next_cursor = last_cursor if count == params.limit else None
+        yield json.dumps({"next_cursor": next_cursor}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
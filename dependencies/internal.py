@@ -0,0 +1,18 @@
+# weavemo-backend/dependencies/internal.py
+import hmac
+
+from fastapi import Header, HTTPException, status
+
+from config.settings import settings
+
+
+async def require_internal_key(x_internal_key: str | None = Header(None)):
+    """
+    /internal/* 보호용. INTERNAL_API_KEY 가 설정되지 않았으면 항상 거부.
+    """
+    expected = settings.INTERNAL_API_KEY
+    if not expected or not x_internal_key or not hmac.compare_digest(x_internal_key, expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Forbidden",
+        )
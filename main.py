@@ -1,10 +1,35 @@
 # main.py
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import auth, user, mood, stats, action, journal, badge, journal_entries
+from core.request_scope import RequestScopeMiddleware
+from db.database import supabase_manager
+from services.catalog_service import catalog
+from services.live_events import live_hub
+from services.post_event_queue import post_event_queue
+from routers import auth, user, mood, stats, action, journal, badge, journal_entries, home, events, sync, export, calendar, search, internal
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # worker 기동 시 connection pool 생성 + warm-up
+    await supabase_manager.start()
+    try:
+        await catalog.load()
+    except Exception:
+        # 첫 요청에서 다시 적재 시도
+        logging.getLogger(__name__).exception("reference catalog load failed at startup")
+    post_event_queue.start()
+    yield
+    # SSE 연결 종료 → 남은 post-event 처리 후 pool 정리
+    live_hub.close()
+    await post_event_queue.stop()
+    await supabase_manager.close()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # ⭐ CORS 설정
 app.add_middleware(
@@ -15,6 +40,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# request-scoped DataLoader + X-DB-Hops
+app.add_middleware(RequestScopeMiddleware)
+
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(user.router, prefix="/user", tags=["Users"])
 app.include_router(mood.router, prefix="/mood", tags=["Mood"])
@@ -23,4 +51,10 @@ app.include_router(action.router, prefix="/actions", tags=["actions"])
 app.include_router(journal.router, prefix="/journals", tags=["Journal"])
 app.include_router(badge.router, prefix="/badges", tags=["badges"])
 app.include_router(journal_entries.router, prefix="/journal-entries", tags=["JournalEntries"])
-
+app.include_router(home.router, prefix="/home", tags=["Home"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
+app.include_router(sync.router, prefix="/sync", tags=["Sync"])
+app.include_router(export.router, prefix="/export", tags=["Export"])
+app.include_router(calendar.router, prefix="/calendar", tags=["Calendar"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(internal.router, prefix="/internal", tags=["Internal"])
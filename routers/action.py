@@ -1,20 +1,24 @@
-from fastapi import APIRouter, Depends
-from db.database import get_supabase
+from fastapi import APIRouter, Depends, Request, Response
+from core.etag import conditional, make_etag
+from services.catalog_service import catalog
 from dependencies.auth import get_current_user
 
 router = APIRouter()
 
 @router.get("/recommended")
-def get_recommended_actions(current_user=Depends(get_current_user)):
-    supabase = get_supabase()
+async def get_recommended_actions(
+    request: Request,
+    response: Response,
+    current_user=Depends(get_current_user),
+):
+    # is_active actions 는 reference catalog 에서 (DB 조회 없음)
+    snapshot = await catalog.get()
 
-    res = (
-        supabase.table("actions")
-        .select("id, title, description, type")
-        .eq("is_active", True)
-        .execute()
-    )
+    # 모든 사용자 공통 → catalog digest 가 곧 version (worker 간 동일)
+    not_modified = conditional(request, response, make_etag("actions/recommended", snapshot.digest))
+    if not_modified is not None:
+        return not_modified
 
     return {
-        "actions": res.data or []
+        "actions": snapshot.actions
     }
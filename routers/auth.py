@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from schemas.auth import LoginRequest, RegisterRequest, AuthResponse
-from core.supabase import get_supabase
+from db.database import get_auth_supabase
 from dependencies.auth import get_current_user
 from supabase_auth.errors import AuthApiError
 
@@ -8,11 +8,11 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=AuthResponse)
-def register(body: RegisterRequest):
-    supabase = get_supabase()
+async def register(body: RegisterRequest):
+    supabase = await get_auth_supabase()
 
     try:
-        res = supabase.auth.sign_up({
+        res = await supabase.auth.sign_up({
             "email": body.email,
             "password": body.password,
             "options": {
@@ -44,11 +44,11 @@ def register(body: RegisterRequest):
     }
 
 @router.post("/login", response_model=AuthResponse)
-def login(body: LoginRequest):
-    supabase = get_supabase()
+async def login(body: LoginRequest):
+    supabase = await get_auth_supabase()
 
     try:
-        res = supabase.auth.sign_in_with_password({
+        res = await supabase.auth.sign_in_with_password({
             "email": body.email,
             "password": body.password,
         })
@@ -76,5 +76,5 @@ def login(body: LoginRequest):
     }
 
 @router.get("/profile")
-def profile(current_user=Depends(get_current_user)):
+async def profile(current_user=Depends(get_current_user)):
     return {"user": current_user}
@@ -0,0 +1,48 @@
+# routers/calendar.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from core.etag import conditional, make_etag
+from db.database import get_supabase
+from dependencies.auth import get_current_user
+from services.calendar_service import get_month_calendar, get_year_calendar
+from services.version_service import get_data_versions
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_calendar(
+    request: Request,
+    response: Response,
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    year: Optional[int] = Query(None, ge=2000, le=2100),
+    supabase=Depends(get_supabase),
+    current_user=Depends(get_current_user),
+):
+    """
+    활동 달력 (moods / journal_entries / actions 하루 단위 유무).
+    - ?month=YYYY-MM : 한 달
+    - ?year=YYYY     : 12 달
+    각 항목: bitmap (bit 0 = 1일), days, count
+    """
+    if (month is None) == (year is None):
+        raise HTTPException(status_code=400, detail="Specify exactly one of month or year")
+
+    user_id: int = current_user["user_id"]
+
+    # 조건부 GET: 세 도메인 version 이 그대로면 304
+    versions = await get_data_versions(supabase, user_id)
+    etag = make_etag(
+        "calendar", user_id, month or year,
+        versions["moods"], versions["journal_entries"], versions["action_logs"],
+    )
+    not_modified = conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    if month is not None:
+        y, m = map(int, month.split("-"))
+        return await get_month_calendar(supabase, user_id=user_id, year=y, month=m)
+    return await get_year_calendar(supabase, user_id=user_id, year=year)
@@ -0,0 +1,55 @@
+# routers/events.py
+from __future__ import annotations
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from config.settings import settings
+from dependencies.auth import get_current_user
+from services.live_events import live_hub
+
+router = APIRouter()
+
+
+def _format(event_id: int, event: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(current_user=Depends(get_current_user)):
+    """
+    Server-Sent Events: xp / level_up / badge
+    - 이 worker 에서 일어난 변경만 전달된다 (worker 간 fan-out 없음)
+    - 연결이 끊기면 클라이언트는 /stats/profile 을 한 번 읽고 다시 구독 (ETag 로 대부분 304)
+    """
+    if live_hub.full:
+        raise HTTPException(status_code=503, detail="Too many event streams")
+
+    user_id: int = current_user["user_id"]
+
+    async def stream():
+        with live_hub.subscribe(user_id) as queue:
+            # 재연결 간격 (ms)
+            yield f"retry: {int(settings.SSE_HEARTBEAT_SEC * 1000)}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SEC)
+                except asyncio.TimeoutError:
+                    # proxy idle timeout 방지 + 끊긴 연결 감지
+                    yield ": ping\n\n"
+                    continue
+                if message is None:
+                    return
+                yield _format(*message)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,49 @@
+# routers/export.py
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from db.database import get_supabase
+from dependencies.auth import get_current_user
+from services.export_service import ndjson_chunks, zip_chunks
+
+router = APIRouter()
+
+
+@router.get("")
+async def export_account(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|zip)$"),
+    supabase=Depends(get_supabase),
+    current_user=Depends(get_current_user),
+):
+    """
+    계정 데이터 전체 내보내기 (user_stats / moods + tags / journals / journal_entries / action_logs / user_badges).
+    - ndjson: 한 줄 = {"type", "data"}. Accept-Encoding: gzip 이면 gzip 으로
+    - zip:    table 별 .ndjson 파일
+    - chunk 단위로 읽으며 바로 전송 (chunked transfer, 전체를 메모리에 올리지 않음)
+    """
+    user_id = current_user["user_id"]
+    filename = f"weavemo-export-{user_id}-{date.today().isoformat()}"
+
+    if format == "zip":
+        return StreamingResponse(
+            zip_chunks(supabase, user_id=user_id),
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.zip"'},
+        )
+
+    gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.ndjson"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        ndjson_chunks(supabase, user_id=user_id, gzip=gzip),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
@@ -0,0 +1,91 @@
+# routers/home.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict
+
+from fastapi import APIRouter, Depends, Query, Response
+
+from db.database import get_supabase
+from dependencies.auth import get_current_user
+from services.catalog_service import catalog
+from services.journal_service import get_entry_dates
+from services.mood_analysis_cache import get_mood_analysis_cached
+from services.stats_service import get_completed_action_ids, get_profile
+from utils.timezone import user_local_date
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def _timed(name: str, coro: Awaitable[Any]) -> tuple[str, Any, str | None, float]:
+    # 한 section 실패가 전체 응답을 깨지 않도록 예외는 여기서 잡는다
+    started = time.perf_counter()
+    try:
+        data, error = await coro, None
+    except Exception as e:
+        logger.exception("home section %s failed", name)
+        data, error = None, type(e).__name__
+    return name, data, error, round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _recommended_actions():
+    return (await catalog.get()).actions
+
+
+@router.get("")
+async def get_home(
+    response: Response,
+    tz_offset_min: int = Query(0),
+    month: str | None = Query(None, regex=r"^\d{4}-\d{2}$"),
+    supabase=Depends(get_supabase),
+    current_user=Depends(get_current_user),
+):
+    """
+    앱 첫 화면 대시보드 (인증 1회, 조회는 동시에).
+    - profile / completed_today / mood_today / recommended_actions / entry_dates
+    - 실패한 section 은 null + errors[section]
+    - section 별 소요 시간: meta.timings_ms, Server-Timing header
+    """
+    user_id: int = current_user["user_id"]
+    month = month or user_local_date(tz_offset_min).strftime("%Y-%m")
+
+    results = await asyncio.gather(
+        _timed("profile", get_profile(
+            supabase,
+            user_id=user_id,
+            auth_uid=current_user["auth_uid"],
+            email=current_user["email"],
+        )),
+        _timed("completed_today", get_completed_action_ids(
+            supabase, user_id=user_id, tz_offset_min=tz_offset_min,
+        )),
+        _timed("mood_today", get_mood_analysis_cached(
+            supabase=supabase, user_id=user_id, range_key="today",
+        )),
+        _timed("recommended_actions", _recommended_actions()),
+        _timed("entry_dates", get_entry_dates(supabase, user_id=user_id, month=month)),
+    )
+
+    body: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    timings: Dict[str, float] = {}
+    for name, data, error, elapsed_ms in results:
+        body[name] = data
+        timings[name] = elapsed_ms
+        if error is not None:
+            errors[name] = error
+
+    response.headers["Server-Timing"] = ", ".join(
+        f"{name};dur={ms}" for name, ms in timings.items()
+    )
+
+    return {
+        **body,
+        "month": month,
+        "errors": errors,
+        "meta": {"timings_ms": timings},
+    }
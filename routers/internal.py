@@ -0,0 +1,31 @@
+# routers/internal.py
+from fastapi import APIRouter, Depends
+
+from db.database import supabase_manager
+from dependencies.auth import identity_cache_stats
+from dependencies.internal import require_internal_key
+from services.catalog_service import catalog
+from services.live_events import live_hub
+from services.mood_analysis_cache import mood_analysis_cache_stats
+from services.post_event_queue import post_event_queue
+
+router = APIRouter(dependencies=[Depends(require_internal_key)])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    return {
+        "supabase_pool": supabase_manager.stats(),
+        "identity_cache": identity_cache_stats(),
+        "catalog": catalog.stats(),
+        "mood_analysis_cache": mood_analysis_cache_stats(),
+        "post_event_queue": post_event_queue.stats(),
+        "live_events": live_hub.stats(),
+    }
+
+
+@router.post("/catalog/refresh")
+async def refresh_catalog():
+    # 이 요청을 받은 worker 만 즉시 재적재, 나머지는 CATALOG_TTL_SEC 안에 따라온다
+    await catalog.load()
+    return {"ok": True, "catalog": catalog.stats()}
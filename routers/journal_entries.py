@@ -1,103 +1,92 @@
 # routers/journal_entries.py
-from fastapi import APIRouter, Depends, Query, Body, Header
-from datetime import date, datetime, timedelta
-from datetime import date as date_type
+from fastapi import APIRouter, Depends, Query, Body, Header, Request, Response
+from datetime import date
+from core.etag import conditional, make_etag
 from dependencies.auth import get_current_user
+from dependencies.history import HistoryParams, history_params, history_response
 from db.database import get_supabase
-from services.stats_service import apply_daily_xp, calculate_level, calc_streak
+from services.history_service import JOURNAL_ENTRIES
+from services.journal_service import get_entry_dates as load_entry_dates, write_journal
+from services.version_service import get_data_versions
+from utils.timezone import user_local_date
 
 router = APIRouter()
 
 @router.post("")
-def create_journal_entry(
+async def create_journal_entry(
     content: str = Body(...),
     date: date = Body(...),
     type: str = Body(...),
     tz_offset_min: int = Header(0),
     current_user=Depends(get_current_user),
 ):
-    supabase = get_supabase()
+    supabase = await get_supabase()
     user_id = current_user["user_id"]
 
-    # insert entry
-    supabase.table("journal_entries").insert({
-        "user_id": user_id,
-        "content": content,
-        "date": date.isoformat(),
-        "type": type,
-        "created_at": datetime.utcnow().isoformat(),
-    }).execute()
-
-    # XP 처리 (기존 stats 로직 재사용)
-     # ✅ 사용자 로컬 날짜 기준 XP 가드
-    utc_now = datetime.utcnow()
-    local_now = utc_now + timedelta(minutes=tz_offset_min)
-    today_str = local_now.date().isoformat()
-    stats = supabase.table("user_stats").select("*").eq("user_id", user_id).execute().data[0]
-
-    # 🔒 journal / journal_entries 통합 하루 1회 XP 가드
-    if stats["daily_journal_xp_date"] == today_str:
-         gained = 0
-         new_xp = stats["xp"]
-         new_level = stats["level"]
-         new_daily_xp = stats["daily_xp"]
-    else:
-         new_daily_xp, gained = apply_daily_xp(0, 10)
-         new_xp = stats["xp"] + gained if gained > 0 else stats["xp"]
-         new_level = calculate_level(new_xp)    
-        
-    supabase.table("user_stats").update({
-        "xp": new_xp,
-        "level": new_level,
-        "daily_xp": new_daily_xp,
-        "daily_journal_xp_date": today_str,
-        "updated_at": "now()",
-    }).eq("user_id", user_id).execute()
+    # entry 저장 + XP (journal / journal_entries 통합 하루 1회, 사용자 로컬 날짜)
+    # write_journal RPC 1회
+    result = await write_journal(
+        supabase,
+        user_id=user_id,
+        kind="entry",
+        content=content,
+        local_day=user_local_date(tz_offset_min),
+        entry_date=date,
+        entry_type=type,
+    )
 
-    return {"ok": True, "xp_gained": gained, "level": new_level}
+    xp = result["xp"]
+    return {"ok": True, "xp_gained": xp["gained_xp"], "level": xp["level"]}
 
 
 @router.get("/by-date")
-def get_by_date(
+async def get_by_date(
     date: date = Query(...),
     current_user=Depends(get_current_user),
 ):
-    supabase = get_supabase()
+    supabase = await get_supabase()
     user_id = current_user["user_id"]
 
-    res = (
+    res = await (
         supabase.table("journal_entries")
-        .select("*")
+        .select(", ".join(JOURNAL_ENTRIES.default_fields))
         .eq("user_id", user_id)
         .eq("date", date.isoformat())
         .order("created_at", desc=False)
         .execute()
     )
 
+    return {"items": res.data}
+
+
 @router.get("/dates")
-def get_entry_dates(
+async def get_entry_dates(
+    request: Request,
+    response: Response,
     month: str = Query(..., regex=r"^\d{4}-\d{2}$"),
     current_user=Depends(get_current_user),
 ):
-    supabase = get_supabase()
+    supabase = await get_supabase()
     user_id = current_user["user_id"]
 
-    start = f"{month}-01"
-    year, mon = map(int, month.split("-"))
-    if mon == 12:
-        end = f"{year + 1}-01-01"
-    else:
-        end = f"{year}-{mon + 1:02d}-01"
+    # 조건부 GET: journal_entries version 이 그대로면 304
+    versions = await get_data_versions(supabase, user_id)
+    etag = make_etag("journal-entries/dates", user_id, month, versions["journal_entries"])
+    not_modified = conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
 
-    res = (
-        supabase.table("journal_entries")
-        .select("date")
-        .eq("user_id", user_id)
-        .gte("date", start)
-        .lt("date", end)
-        .execute()
-    )
-
-    dates = sorted({row["date"] for row in res.data})
+    dates = await load_entry_dates(supabase, user_id=user_id, month=month)
     return {"dates": dates}
-    return {"items": res.data}
+
+
+@router.get("/history")
+async def get_entry_history(
+    params: HistoryParams = Depends(history_params),
+    current_user=Depends(get_current_user),
+):
+    """최신순 (date, created_at, id) keyset pagination. ?cursor=next_cursor 로 다음 페이지"""
+    supabase = await get_supabase()
+    return await history_response(
+        supabase, JOURNAL_ENTRIES, user_id=current_user["user_id"], params=params,
+    )
@@ -1,15 +1,24 @@
 # weavemo-backend/routers/mood.py
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from datetime import date, datetime, timezone
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from core.compact import COLUMNAR_MEDIA_TYPE, VARY, compact_response, negotiated_encoding, wants_columnar
+from core.etag import conditional, make_etag
 from db.database import get_supabase
 from dependencies.auth import get_current_user
+from dependencies.history import HistoryParams, history_params, history_response
 from schemas.mood import MoodInput, MoodResult, MoodAnalysisResponse
-from services.mood_service import get_mood_analysis
+from services.catalog_service import resolve_tag_ids
+from services.history_service import MOODS
+from services.mood_analysis_cache import get_mood_analysis_cached
+from services.mood_service import UnknownTagCodes, create_mood, to_columnar
+from services.mood_trends_service import get_mood_trends
+from services.post_event_queue import post_event_queue
+from services.version_service import get_data_versions
 
 router = APIRouter()
 
@@ -19,15 +28,15 @@ router = APIRouter()
     response_model=MoodResult,
     status_code=status.HTTP_200_OK,
 )
-def submit_mood(
+async def submit_mood(
     payload: MoodInput,
     supabase=Depends(get_supabase),
     current_user=Depends(get_current_user),
 ):
     """
     Week 3 (LOCK):
-    - 하루 1회 (user_id + UTC date) upsert
-    - tags: 전체 삭제 후 재삽입
+    - 하루 여러번 기록 허용 (user_id + UTC date)
+    - mood + tags 를 submit_mood RPC 1회로 저장 (부분 저장 없음)
     """
 
     # 0️⃣ 내부 user_id (BIGINT)
@@ -35,52 +44,42 @@ def submit_mood(
 
     # 1️⃣ UTC 기준 날짜
     now_utc = datetime.now(timezone.utc)
-    today = now_utc.date().isoformat()
+    today = now_utc.date()
 
-    # 2️⃣ 오늘 mood 조회/항상 insert(하루 여러번 기록 허용)
-    mood_write: Dict[str, Any] = {
-        "user_id": user_id,
-        "date": today,
-        "recorded_at": now_utc.isoformat(),
-        "main_valence": payload.mainValence,
-        "energy": payload.energy,
-        "trigger_type": payload.triggerType,
-        "note": payload.note,
-    }
-
-    created = supabase.table("moods").insert(mood_write).execute()
-    mood_id = created.data[0]["id"]
-
-
-    # 4️⃣ 태그 동기화
+    # 2️⃣ 태그 code 검증 (reference catalog, DB 조회 없음)
     tag_codes: List[str] = payload.tagIds or []
-
-    supabase.table("mood_emotion_tags").delete().eq("mood_id", mood_id).execute()
-
-    if tag_codes:
-        tag_rows = (
-            supabase.table("emotion_tags")
-            .select("id, code")
-            .in_("code", tag_codes)
-            .execute()
-            .data
-            or []
+    _, missing = await resolve_tag_ids(tag_codes)
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Unknown tag codes", "missing": missing},
         )
 
-        found = {t["code"] for t in tag_rows}
-        missing = [c for c in tag_codes if c not in found]
-        if missing:
-            raise HTTPException(
-                status_code=400,
-                detail={"message": "Unknown tag codes", "missing": missing},
-            )
+    # 3️⃣ mood + tags 저장 (DB 에서 한 번 더 검증)
+    try:
+        mood_id = await create_mood(
+            supabase=supabase,
+            user_id=user_id,
+            day=today,
+            recorded_at=now_utc,
+            main_valence=payload.mainValence,
+            energy=payload.energy,
+            trigger_type=payload.triggerType,
+            note=payload.note,
+            tag_codes=tag_codes,
+        )
+    except UnknownTagCodes as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Unknown tag codes", "missing": e.missing},
+        )
 
-        joins = [{"mood_id": mood_id, "tag_id": t["id"]} for t in tag_rows]
-        supabase.table("mood_emotion_tags").insert(joins).execute()
+    # 4️⃣ badge 평가는 background 에서
+    post_event_queue.enqueue(user_id, "mood")
 
     return MoodResult(
         moodId=mood_id,
-        date=today,
+        date=today.isoformat(),
         mainValence=payload.mainValence,
         energy=payload.energy,
         triggerType=payload.triggerType,
@@ -97,8 +96,11 @@ def submit_mood(
     response_model=MoodAnalysisResponse,
     status_code=status.HTTP_200_OK,
 )
-def get_analysis(
+async def get_analysis(
+    request: Request,
+    response: Response,
     range: str = Query("today", regex="^(today|7d|30d)$"),
+    format: Optional[str] = Query(None, pattern="^(json|columnar)$"),
     supabase=Depends(get_supabase),
     current_user=Depends(get_current_user),
 ):
@@ -106,18 +108,113 @@ def get_analysis(
     Week 4:
     - range: today | 7d | 30d
     - 분석은 집계 기반 (AI ❌)
+    - ?format=columnar 또는 Accept: application/vnd.weavemo.columnar+json
+      → points / tagsSummary 를 column 배열로 (orjson + br / gzip)
     """
 
     user_id: int = current_user["user_id"]
+    columnar = wants_columnar(request, format)
+    response.headers["Vary"] = VARY
+
+    # 조건부 GET: 기간은 UTC 날짜 기준이므로 날짜 + moods version (+ columnar 는 표현 / content-coding)
+    versions = await get_data_versions(supabase, user_id)
+    utc_date = datetime.now(timezone.utc).date()
+    etag = make_etag(
+        "mood/analysis", user_id, range, utc_date, versions["moods"],
+        columnar, negotiated_encoding(request) if columnar else None,
+    )
+    not_modified = conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
 
     try:
-        return get_mood_analysis(
+        # ETag 와 같은 version 으로 계산된 body 만 (다른 worker 에서 쓴 뒤 stale body 방지)
+        result = await get_mood_analysis_cached(
             supabase=supabase,
             user_id=user_id,
             range_key=range,
+            moods_version=versions["moods"],
         )
     except ValueError:
         raise HTTPException(
             status_code=400,
             detail="Invalid range value",
         )
+
+    if columnar:
+        # Response 를 직접 돌려주므로 response_model 재검증 없음
+        return compact_response(
+            request, to_columnar(result), response=response, media_type=COLUMNAR_MEDIA_TYPE,
+        )
+    return result
+
+
+# --------------------------------------
+# Mood trends (장기 추세)
+# --------------------------------------
+@router.get("/trends")
+async def get_trends(
+    request: Request,
+    response: Response,
+    range: str = Query("90d", pattern="^(7d|30d|90d|365d|custom)$"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    points: int = Query(120, ge=10, le=1000),
+    window: int = Query(7, ge=1, le=60),
+    supabase=Depends(get_supabase),
+    current_user=Depends(get_current_user),
+):
+    """
+    - range: 7d | 30d | 90d | 365d | custom (from, to 필요)
+    - points: 차트 point 최대 개수 (LTTB downsampling)
+    - window: rolling 평균 일수
+    points 는 column 배열, summary / weekday / distribution / triggers / tags 포함
+    """
+
+    user_id: int = current_user["user_id"]
+    response.headers["Vary"] = VARY
+
+    versions = await get_data_versions(supabase, user_id)
+    utc_date = datetime.now(timezone.utc).date()
+    etag = make_etag(
+        "mood/trends", user_id, range, date_from, date_to, points, window, utc_date, versions["moods"],
+        negotiated_encoding(request),
+    )
+    not_modified = conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        trends = await get_mood_trends(
+            supabase,
+            user_id=user_id,
+            range_key=range,
+            date_from=date_from,
+            date_to=date_to,
+            window=window,
+            max_points=points,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # points 는 이미 column 배열 → orjson + br / gzip 만
+    return compact_response(request, trends, response=response)
+
+
+# --------------------------------------
+# Mood history
+# --------------------------------------
+@router.get("/history")
+async def get_history(
+    params: HistoryParams = Depends(history_params),
+    supabase=Depends(get_supabase),
+    current_user=Depends(get_current_user),
+):
+    """
+    최신순 (date, created_at, id) keyset pagination.
+    - ?fields=id,date,main_valence 로 컬럼 선택
+    - ?format=ndjson 이면 한 줄에 한 row 로 stream
+    """
+    return await history_response(
+        supabase, MOODS, user_id=current_user["user_id"], params=params,
+    )
@@ -0,0 +1,43 @@
+# routers/search.py
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from db.database import get_supabase
+from dependencies.auth import get_current_user
+from services.search_service import SOURCES, search_journals
+
+router = APIRouter()
+
+
+@router.get("/journals")
+async def search_journal_content(
+    q: str = Query(..., min_length=1, max_length=200),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    source: Optional[str] = Query(None, pattern="^(journals|journal_entries)$"),
+    limit: int = Query(20, ge=1, le=100),
+    supabase=Depends(get_supabase),
+    current_user=Depends(get_current_user),
+):
+    """
+    내 journal / journal entry 본문 검색.
+    - q: 공백으로 나눈 검색어를 모두 포함하는 글 (대소문자 무시, 한국어 부분 문자열 가능)
+    - from / to: 날짜 범위 (포함). journals 는 created_at 날짜 기준
+    - source: 한쪽만 검색 (기본 둘 다)
+    결과: 관련도 → 최신순, 본문 대신 snippet {text, matches}
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="from must be on or before to")
+
+    results = await search_journals(
+        supabase,
+        user_id=current_user["user_id"],
+        query=q,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+        sources=[source] if source else list(SOURCES),
+    )
+    return {"query": q, "count": len(results), "results": results}
@@ -1,203 +1,110 @@
 # /routers/stats.py
 
-from fastapi import APIRouter, Depends, Query
-from datetime import date, datetime, time, timezone, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
+from core.etag import conditional, make_etag
 from dependencies.auth import get_current_user
 from db.database import get_supabase
-from services.stats_service import (
-    calculate_level,
-    apply_daily_xp,
-    calc_streak,
-)
+from services.live_events import publish_xp
+from services.post_event_queue import post_event_queue
+from services.stats_service import get_completed_action_ids, get_profile
+from services.version_service import get_data_versions
+from services.xp_service import XP_SOURCES, get_xp_store
+from utils.timezone import user_local_date
 
 router = APIRouter()
 
-def _user_today_range_utc(tz_offset_min: int):
-    """
-    tz_offset_min: user timezone offset in minutes (KST = 540)
-    returns: (today_str, utc_start_iso, utc_end_iso)
-    """
-    offset = timedelta(minutes=tz_offset_min)
-    now_utc = datetime.now(timezone.utc)
-    user_now = now_utc + offset
-    user_today = user_now.date()
-
-    user_start = datetime.combine(user_today, time.min)
-    user_end = datetime.combine(user_today, time.max)
-
-    utc_start = (user_start - offset)
-    utc_end = (user_end - offset)
-
-    return (
-        user_today.isoformat(),
-        utc_start.isoformat(),
-        utc_end.isoformat(),
-    )
-
 @router.get("/profile")
-def get_stats_profile(current_user=Depends(get_current_user)):
-    supabase = get_supabase()
+async def get_stats_profile(
+    request: Request,
+    response: Response,
+    current_user=Depends(get_current_user),
+):
+    supabase = await get_supabase()
     user_id = current_user["user_id"]
 
-    res = supabase.table("user_stats").select("*").eq("user_id", user_id).execute()
-    if not res.data:
-        supabase.table("user_stats").insert({
-            "user_id": user_id,
-        }).execute()
-        res = supabase.table("user_stats").select("*").eq("user_id", user_id).execute()
-
-    row = res.data[0]
-
-    return {
-        "level": row["level"],
-        "xp": row["xp"],
-        "streak_days": row["streak_days"],
-        "daily_xp": row["daily_xp"],
-        "daily_xp_cap": 150,
-        "plan": row["plan"],
-    }
+    # 조건부 GET: user_stats version 이 그대로면 304
+    versions = await get_data_versions(supabase, user_id)
+    not_modified = conditional(request, response, make_etag("stats/profile", user_id, versions["stats"]))
+    if not_modified is not None:
+        return not_modified
+
+    return await get_profile(
+        supabase,
+        user_id=user_id,
+        auth_uid=current_user["auth_uid"],
+        email=current_user["email"],
+    )
 
 
 @router.get("/actions/completed/today")
-def get_completed_actions_today(tz_offset_min: int = Query(0), current_user=Depends(get_current_user),):
-    supabase = get_supabase()
+async def get_completed_actions_today(
+    request: Request,
+    response: Response,
+    tz_offset_min: int = Query(0),
+    current_user=Depends(get_current_user),
+):
+    supabase = await get_supabase()
     user_id = current_user["user_id"]
 
-    _, start, end = _user_today_range_utc(tz_offset_min)
+    local_day = user_local_date(tz_offset_min)
 
-    res = (
-        supabase.table("action_logs")
-        .select("action_id")
-        .eq("user_id", user_id)
-        .gte("started_at", start)
-        .lte("started_at", end)
-        .execute()
-    )
+    # 조건부 GET: 로컬 날짜 + action_logs version
+    versions = await get_data_versions(supabase, user_id)
+    etag = make_etag("stats/actions/today", user_id, local_day, tz_offset_min, versions["action_logs"])
+    not_modified = conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
 
-    actions = [r["action_id"] for r in res.data] if res.data else []
+    actions = await get_completed_action_ids(supabase, user_id=user_id, tz_offset_min=tz_offset_min)
     return {"actions": actions}
 
 
 @router.post("/xp/increment")
-def increment_xp(
+async def increment_xp(
     amount: int = Query(..., gt=0),
     source: str = Query(...),   # journal | mood | action
     action_id: int | None = Query(None),
     tz_offset_min: int = Query(0),
     current_user=Depends(get_current_user),
+    xp_store=Depends(get_xp_store),
 ):
-    supabase = get_supabase()
     user_id = current_user["user_id"]
     source = source.lower()
     if source == "journals":
         source = "journal"
+    if source not in XP_SOURCES:
+        raise HTTPException(status_code=400, detail=f"source must be one of {', '.join(XP_SOURCES)}")
 
-    today_str, start, end = _user_today_range_utc(tz_offset_min)
-
-    # ── user_stats 조회 ────────────────────────
-    res = supabase.table("user_stats").select("*").eq("user_id", user_id).execute()
-    row = res.data[0]
-
-    # ── ACTION 하루 1회 가드 (추가된 유일한 로직) ──────────
-    if source == "action":
-        if action_id is None:
-            return {"gained_xp": 0, "blocked": True}
-
-        # start / end already calculated in user timezone (UTC)
-        existing = (
-            supabase.table("action_logs")
-            .select("id")
-            .eq("user_id", user_id)
-            .eq("action_id", action_id)
-#            .gte("started_at", start)
-#            .lte("started_at", end)
-            .gte("completed_at", start)
-            .lte("completed_at", end)
-            .limit(1)
-            .execute()
-        )
-
-        if existing.data:
-            return {"gained_xp": 0, "blocked": True}
-
-    # ── SOURCE별 하루 1회 가드 (기존 그대로) ──────────
-    if source == "mood" and row.get("daily_mood_xp_date") == today_str:
+    if source == "action" and action_id is None:
         return {"gained_xp": 0, "blocked": True}
 
-    if source in ["journal", "journals"] and row.get("daily_journal_xp_date") == today_str:
-        return {"gained_xp": 0, "blocked": True}
-
-    # ── DAILY XP CAP (기존 그대로) ─────────────────
-    daily_xp = row["daily_xp"] if row["daily_xp_date"] == today_str else 0
-    new_daily_xp, gained = apply_daily_xp(daily_xp, amount)
+    # ledger 가드 / cap / level / streak / action_logs 를 DB 에서 한 번에 (RPC 1회)
+    result = await xp_store.apply(
+        user_id=user_id,
+        source=source,
+        amount=amount,
+        source_id=action_id if source == "action" else 0,
+        local_day=user_local_date(tz_offset_min),
+    )
 
-    if gained == 0:
-        return {"gained_xp": 0, "blocked": True}
+    # 구독 중인 클라이언트에 push, badge 평가는 background 에서
+    publish_xp(user_id, source, result)
+    if not result.get("blocked"):
+        post_event_queue.enqueue(user_id, source)
 
-    new_xp = row["xp"] + gained
-    new_level = calculate_level(new_xp)
-
-    # ── STREAK (기존 그대로) ─────────────────────
-    delta = calc_streak(row["last_checkin_date"], date.fromisoformat(today_str))
-    new_streak = row["streak_days"]
-    if delta == 1:
-        new_streak += 1
-    elif delta == -1:
-        new_streak = 1
-
-    update_data = {
-        "xp": new_xp,
-        "level": new_level,
-        "daily_xp": new_daily_xp,
-        "daily_xp_date": today_str,
-        "streak_days": new_streak,
-        "last_checkin_date": today_str,
-        "updated_at": "now()",
-    }
-
-    if source == "mood":
-        update_data["daily_mood_xp_date"] = today_str
-
-    if source == "journal":
-        update_data["daily_journal_xp_date"] = today_str
-
-    supabase.table("user_stats").update(update_data).eq("user_id", user_id).execute()
-
-    # ── ACTION 완료 기록 (추가된 유일한 insert) ──────────
-#    if source == "action":
-#        supabase.table("action_logs").insert({
-#            "user_id": user_id,
-#            "action_id": action_id,
-#            "started_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-#        }).execute()
-    if source == "action":
-       supabase.table("action_logs").insert({
-           "user_id": user_id,
-           "action_id": action_id,
-           # started_at은 DB default(now())
-           "completed_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-       }).execute()
-
-    return {
-        "gained_xp": gained,
-        "total_xp": new_xp,
-        "level": new_level,
-        "streak_days": new_streak,
-        "daily_xp": new_daily_xp,
-        "blocked": False,
-    }
+    return result
 
 @router.post("/actions/feedback")
-def save_action_feedback(
+async def save_action_feedback(
     action_id: int = Query(...),
     feedback: int = Query(...),  # -1 | 0 | 1
     current_user=Depends(get_current_user),
 ):
-    supabase = get_supabase()
+    supabase = await get_supabase()
     user_id = current_user["user_id"]
 
-    supabase.table("action_logs").update({
+    await supabase.table("action_logs").update({
         "feedback": feedback,
     }).eq("user_id", user_id).eq("action_id", action_id).is_("feedback", None).execute()
 
@@ -0,0 +1,24 @@
+# routers/sync.py
+from fastapi import APIRouter, Depends
+
+from db.database import get_supabase
+from dependencies.auth import get_current_user
+from schemas.sync import SyncBatch
+from services.sync_service import ingest_events
+
+router = APIRouter()
+
+
+@router.post("/batch")
+async def sync_batch(
+    body: SyncBatch,
+    supabase=Depends(get_supabase),
+    current_user=Depends(get_current_user),
+):
+    """
+    오프라인 중 쌓인 mood / journal entry / XP event 일괄 저장.
+    - clientId 로 멱등 (재전송 시 status=duplicate + 처음 결과)
+    - XP / streak 는 occurredAt 시간순으로 적용
+    - DB round trip 1회 (sync_events RPC)
+    """
+    return await ingest_events(supabase, user_id=current_user["user_id"], events=body.events)
@@ -6,7 +6,7 @@ router = APIRouter()
 
 
 @router.get("/me")
-def get_my_profile(current_user=Depends(get_current_user)):
+async def get_my_profile(current_user=Depends(get_current_user)):
     return {
         "user": current_user
     }
@@ -0,0 +1,47 @@
+# schemas/sync.py
+from datetime import date, datetime
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+# 한 번에 받는 최대 event 수
+MAX_SYNC_EVENTS = 200
+
+
+class _SyncEventBase(BaseModel):
+    clientId: str = Field(..., min_length=1, max_length=64)   # 멱등 key (클라이언트 생성)
+    occurredAt: datetime      # 클라이언트 시각. offset 이 없으면 tzOffsetMin 으로 해석 (로컬 날짜는 항상 tzOffsetMin 기준)
+    tzOffsetMin: int = 0      # KST = 540
+
+
+class MoodSyncEvent(_SyncEventBase):
+    type: Literal["mood"]
+    mainValence: int = Field(..., ge=-2, le=2)
+    energy: int = Field(..., ge=1, le=5)
+    tagIds: Optional[List[str]] = None
+    triggerType: Optional[str] = None
+    note: Optional[str] = Field(default=None, max_length=200)
+
+
+class JournalEntrySyncEvent(_SyncEventBase):
+    type: Literal["journal_entry"]
+    content: str
+    date: date
+    entryType: str
+
+
+class XpSyncEvent(_SyncEventBase):
+    type: Literal["xp"]
+    source: str               # journal | mood | action
+    amount: int = Field(..., gt=0)
+    actionId: Optional[int] = None
+
+
+SyncEvent = Annotated[
+    Union[MoodSyncEvent, JournalEntrySyncEvent, XpSyncEvent],
+    Field(discriminator="type"),
+]
+
+
+class SyncBatch(BaseModel):
+    events: List[SyncEvent] = Field(..., max_length=MAX_SYNC_EVENTS)
@@ -0,0 +1,54 @@
+"""
+BADGE_RULES (services/badge_service.py) 를 기존 사용자 전체에 다시 적용한다.
+규칙을 추가한 뒤 한 번 실행 (db/migrations/008_badge_awards.sql award_badges_bulk).
+사용자 id 를 batch 로 나눠 RPC 를 호출하고, 이미 가진 뱃지는 건너뛴다.
+
+    python -m scripts.backfill_badges --batch-size 1000
+"""
+import argparse
+import asyncio
+from collections import Counter
+
+from db.database import get_supabase, supabase_manager
+from services.badge_service import award_badges_bulk
+
+
+async def backfill(batch_size: int) -> None:
+    supabase = await get_supabase()
+    last_id = 0
+    total_users = 0
+    awarded: Counter = Counter()
+
+    try:
+        while True:
+            users = (
+                await supabase.table("users")
+                .select("id")
+                .gt("id", last_id)
+                .order("id")
+                .limit(batch_size)
+                .execute()
+            ).data or []
+            if not users:
+                break
+
+            user_ids = [u["id"] for u in users]
+            rows = await award_badges_bulk(supabase, user_ids=user_ids)
+
+            last_id = user_ids[-1]
+            total_users += len(user_ids)
+            awarded.update(r["badge_code"] for r in rows)
+            print(f"users≤{last_id}: {total_users} users, awarded {dict(awarded)}")
+    finally:
+        await supabase_manager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+기존 moods 로 mood_daily_rollups 를 다시 계산한다 (db/migrations/006_mood_daily_rollups.sql).
+사용자 id 를 batch 로 나눠 backfill_mood_daily_rollups RPC 를 호출한다.
+
+    python -m scripts.backfill_mood_rollups --batch-size 500
+"""
+import argparse
+import asyncio
+
+from db.database import get_supabase, supabase_manager
+
+
+async def backfill(batch_size: int) -> None:
+    supabase = await get_supabase()
+    last_id = 0
+    total_users = total_rows = 0
+
+    try:
+        while True:
+            users = (
+                await supabase.table("users")
+                .select("id")
+                .gt("id", last_id)
+                .order("id")
+                .limit(batch_size)
+                .execute()
+            ).data or []
+            if not users:
+                break
+
+            user_ids = [u["id"] for u in users]
+            res = await supabase.rpc("backfill_mood_daily_rollups", {"p_user_ids": user_ids}).execute()
+
+            last_id = user_ids[-1]
+            total_users += len(user_ids)
+            total_rows += res.data or 0
+            print(f"users≤{last_id}: {total_users} users, {total_rows} rollup rows")
+    finally:
+        await supabase_manager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
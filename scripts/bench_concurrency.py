@@ -0,0 +1,112 @@
+"""
+동시성 벤치마크 (requests/sec).
+
+1) simulate: 같은 DB 지연을 가진 두 라우트를 in-process 로 비교
+   - sync def  + blocking I/O  (이전 구조: threadpool 스레드 점유)
+   - async def + awaited I/O   (현재 구조)
+
+   python -m scripts.bench_concurrency simulate --latency-ms 100 -c 500 -n 2000
+
+2) url: 실행 중인 서버에 직접 부하 (배포 전/후 비교용)
+
+   python -m scripts.bench_concurrency url \\
+       --base http://localhost:8000 --path /stats/profile --token $TOKEN -c 200 -n 2000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+
+def _build_app(latency: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_route():
+        time.sleep(latency)  # blocking .execute() 와 동일한 효과
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_route():
+        await asyncio.sleep(latency)  # awaited .execute() 와 동일한 효과
+        return {"ok": True}
+
+    return app
+
+
+async def _drive(client: httpx.AsyncClient, path: str, concurrency: int, total: int, headers: dict) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                res = await client.get(path, headers=headers)
+                if res.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+    }
+
+
+async def simulate(args) -> None:
+    app = _build_app(args.latency_ms / 1000)
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        for path in ("/sync", "/async"):
+            print(await _drive(client, path, args.concurrency, args.requests, {}))
+
+
+async def against_url(args) -> None:
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base, limits=limits, timeout=60) as client:
+        print(await _drive(client, args.path, args.concurrency, args.requests, headers))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    sim = sub.add_parser("simulate")
+    sim.add_argument("--latency-ms", type=float, default=100)
+
+    url = sub.add_parser("url")
+    url.add_argument("--base", default="http://localhost:8000")
+    url.add_argument("--path", default="/stats/profile")
+    url.add_argument("--token", default=None)
+
+    for p in (sim, url):
+        p.add_argument("-c", "--concurrency", type=int, default=200)
+        p.add_argument("-n", "--requests", type=int, default=2000)
+
+    args = parser.parse_args()
+    asyncio.run(simulate(args) if args.mode == "simulate" else against_url(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
+import asyncio
+
 from db.database import get_supabase
 
-def seed_actions():
-    supabase = get_supabase()
+async def seed_actions():
+    supabase = await get_supabase()
 
     actions = [
         {
@@ -17,7 +19,7 @@ def seed_actions():
     ]
 
     for action in actions:
-        supabase.table("actions").upsert(action).execute()
+        await supabase.table("actions").upsert(action).execute()
 
 if __name__ == "__main__":
-    seed_actions()
+    asyncio.run(seed_actions())
@@ -0,0 +1,108 @@
+# services/badge_service.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from core.dataloader import invalidate_rows, rows_loader
+from services.catalog_service import catalog
+from services.live_events import publish_badges
+
+
+@dataclass(frozen=True)
+class BadgeRule:
+    """
+    user_stats[stat] >= threshold 이면 code 뱃지.
+    sources: 이 source 이벤트 뒤에만 평가 (None = 모든 source)
+    """
+    code: str
+    stat: str
+    threshold: int
+    sources: Optional[tuple[str, ...]] = None
+
+
+# ⚠️ 규칙 추가 후 기존 사용자에게도 지급하려면: python -m scripts.backfill_badges
+BADGE_RULES: tuple[BadgeRule, ...] = (
+    BadgeRule("calmdown_rookie", "total_actions", 5, sources=("action",)),   # 행동 5회
+    BadgeRule("journal_starter", "total_journals", 5, sources=("journal",)), # 일기 5회
+    BadgeRule("streak_7", "streak_days", 7),                                 # 스트릭 7일
+)
+
+
+def evaluate_rules(
+    stats: Dict[str, Any],
+    source: Optional[str] = None,
+    rules: Sequence[BadgeRule] = BADGE_RULES,
+) -> List[str]:
+    """규칙 한 번 훑어서 조건을 만족하는 뱃지 code 목록"""
+    return [
+        rule.code
+        for rule in rules
+        if (rule.sources is None or source in rule.sources)
+        and (stats.get(rule.stat) or 0) >= rule.threshold
+    ]
+
+
+async def award_badges(supabase, *, user_id: int, codes: List[str]) -> List[str]:
+    """
+    upsert 1회로 지급. (user_id, badge_id) unique + ignore duplicates 이므로
+    이미 가진 뱃지는 조용히 건너뛰고, 새로 insert 된 row 만 돌아온다.
+    returns: 새로 받은 뱃지 code
+    """
+    snapshot = await catalog.get()
+    badges = [snapshot.badges[code] for code in codes if code in snapshot.badges]
+    if not badges:
+        return []
+
+    earned_at = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+    res = await (
+        supabase.table("user_badges")
+        .upsert(
+            [{"user_id": user_id, "badge_id": b["id"], "earned_at": earned_at} for b in badges],
+            on_conflict="user_id,badge_id",
+            ignore_duplicates=True,
+        )
+        .execute()
+    )
+
+    inserted = {row["badge_id"] for row in res.data or []}
+    if inserted:
+        invalidate_rows("user_badges", user_id)
+    return [b["code"] for b in badges if b["id"] in inserted]
+
+
+async def check_badges(supabase, *, user_id: int, source: Optional[str]) -> List[str]:
+    """source 이벤트 후 뱃지 평가 + 지급. returns: 새로 받은 뱃지 code"""
+    rows = await rows_loader(supabase, "user_stats", "user_id").load(user_id)
+    if not rows:
+        return []
+
+    codes = evaluate_rules(rows[0], source)
+    if not codes:
+        return []
+
+    earned = await award_badges(supabase, user_id=user_id, codes=codes)
+    publish_badges(user_id, earned)
+    return earned
+
+
+async def award_badges_bulk(
+    supabase,
+    *,
+    rules: Sequence[BadgeRule] = BADGE_RULES,
+    user_ids: Optional[List[int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    규칙을 user_stats 전체(또는 user_ids)에 DB 에서 set 단위로 재평가 + 지급 (award_badges_bulk RPC).
+    source 조건은 보지 않는다 (누적 stat 기준 backfill).
+    returns: [{"user_id": ..., "badge_code": ...}] 새로 지급된 것만
+    """
+    res = await supabase.rpc("award_badges_bulk", {
+        "p_rules": [
+            {"code": r.code, "stat": r.stat, "threshold": r.threshold} for r in rules
+        ],
+        "p_user_ids": user_ids,
+    }).execute()
+    return res.data or []
@@ -0,0 +1,68 @@
+# services/calendar_service.py
+
+from __future__ import annotations
+
+import calendar
+from datetime import date
+from typing import Any, Dict, List
+
+# user_activity_months 컬럼 → 응답 key (db/migrations/012_user_activity_months.sql)
+KINDS = {
+    "mood_days": "moods",
+    "journal_days": "journal_entries",
+    "action_days": "actions",
+}
+
+
+def bitmap_days(bitmap: int) -> List[int]:
+    # bit 0 = 1일
+    return [i + 1 for i in range(31) if bitmap >> i & 1]
+
+
+async def load_months(
+    supabase,
+    *,
+    user_id: int,
+    year: int,
+    first_month: int = 1,
+    last_month: int = 12,
+) -> Dict[int, Dict[str, int]]:
+    """월 → {"mood_days": bitmap, ...}. PK range 조회 1회, 최대 12 row"""
+    res = await (
+        supabase.table("user_activity_months")
+        .select("month, " + ", ".join(KINDS))
+        .eq("user_id", user_id)
+        .gte("month", date(year, first_month, 1).isoformat())
+        .lte("month", date(year, last_month, 1).isoformat())
+        .execute()
+    )
+
+    months: Dict[int, Dict[str, int]] = {}
+    for row in res.data or []:
+        month = date.fromisoformat(str(row["month"])[:10]).month
+        months[month] = {k: row[k] or 0 for k in KINDS}
+    return months
+
+
+def _month_view(year: int, month: int, bitmaps: Dict[str, int]) -> Dict[str, Any]:
+    view: Dict[str, Any] = {
+        "month": f"{year}-{month:02d}",
+        "days_in_month": calendar.monthrange(year, month)[1],
+    }
+    for column, key in KINDS.items():
+        bitmap = bitmaps.get(column, 0)
+        view[key] = {"bitmap": bitmap, "days": bitmap_days(bitmap), "count": bin(bitmap).count("1")}
+    return view
+
+
+async def get_month_calendar(supabase, *, user_id: int, year: int, month: int) -> Dict[str, Any]:
+    months = await load_months(supabase, user_id=user_id, year=year, first_month=month, last_month=month)
+    return _month_view(year, month, months.get(month, {}))
+
+
+async def get_year_calendar(supabase, *, user_id: int, year: int) -> Dict[str, Any]:
+    months = await load_months(supabase, user_id=user_id, year=year)
+    return {
+        "year": year,
+        "months": [_month_view(year, m, months.get(m, {})) for m in range(1, 13)],
+    }
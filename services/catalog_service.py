@@ -0,0 +1,145 @@
+# services/catalog_service.py
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from config.settings import settings
+from db.database import get_supabase
+
+logger = logging.getLogger(__name__)
+
+# 모르는 tag code 로 인한 강제 재적재 최소 간격 (잘못된 요청 반복 시 DB 보호)
+_MISS_RELOAD_INTERVAL_SEC = 5.0
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    reference table 한 벌. 교체만 하고 수정하지 않는다 (reader 는 lock 불필요).
+    - version: worker 내 증가 번호
+    - digest:  내용 hash (worker 간 동일 → ETag 등에 사용)
+    """
+    version: int
+    digest: str
+    loaded_at: float
+    emotion_tags: Dict[str, Dict[str, Any]] = field(default_factory=dict)   # code → row
+    badges: Dict[str, Dict[str, Any]] = field(default_factory=dict)         # code → row
+    actions: List[Dict[str, Any]] = field(default_factory=list)             # is_active 만
+
+
+class ReferenceCatalog:
+    """
+    emotion_tags / badges / actions in-process 캐시.
+
+    - lifespan 에서 load(), 이후 ttl 이 지나면 백그라운드 refresh (stale-while-revalidate)
+    - POST /internal/catalog/refresh 로 즉시 재적재 (해당 worker)
+    """
+
+    def __init__(self, *, ttl: float):
+        self.ttl = ttl
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock = asyncio.Lock()
+        self._refreshing: asyncio.Task | None = None
+        self.loads = 0
+        self.load_errors = 0
+
+    async def _fetch(self) -> CatalogSnapshot:
+        supabase = await get_supabase()
+
+        tags_res, badges_res, actions_res = await asyncio.gather(
+            supabase.table("emotion_tags").select("id, code").execute(),
+            supabase.table("badges").select("id, code").execute(),
+            supabase.table("actions")
+            .select("id, title, description, type")
+            .eq("is_active", True)
+            .order("id")
+            .execute(),
+        )
+
+        tags = tags_res.data or []
+        badges = badges_res.data or []
+        actions = actions_res.data or []
+
+        digest = hashlib.sha1(
+            json.dumps([tags, badges, actions], sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+
+        return CatalogSnapshot(
+            version=(self._snapshot.version + 1) if self._snapshot else 1,
+            digest=digest,
+            loaded_at=time.monotonic(),
+            emotion_tags={t["code"]: t for t in tags},
+            badges={b["code"]: b for b in badges},
+            actions=actions,
+        )
+
+    async def load(self, *, seen: CatalogSnapshot | None = None, force: bool = True) -> CatalogSnapshot:
+        """
+        force=False: 호출자가 본 snapshot(seen) 이 lock 을 기다리는 동안 이미 교체됐으면
+        다시 읽지 않고 그것을 돌려준다 (동시 miss / cold start 가 reload 1회로 합쳐짐)
+        """
+        async with self._lock:
+            if not force and self._snapshot is not seen:
+                return self._snapshot
+            try:
+                self._snapshot = await self._fetch()
+            except Exception:
+                self.load_errors += 1
+                raise
+            self.loads += 1
+            return self._snapshot
+
+    async def _refresh_in_background(self, seen: CatalogSnapshot) -> None:
+        try:
+            await self.load(seen=seen, force=False)
+        except Exception:
+            logger.exception("reference catalog refresh failed")
+
+    async def get(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self.load(seen=None, force=False)
+
+        expired = time.monotonic() - snapshot.loaded_at > self.ttl
+        if expired and (self._refreshing is None or self._refreshing.done()):
+            self._refreshing = asyncio.create_task(self._refresh_in_background(snapshot))
+
+        return snapshot
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "digest": snapshot.digest if snapshot else None,
+            "age_sec": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None,
+            "emotion_tags": len(snapshot.emotion_tags) if snapshot else 0,
+            "badges": len(snapshot.badges) if snapshot else 0,
+            "actions": len(snapshot.actions) if snapshot else 0,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+        }
+
+
+catalog = ReferenceCatalog(ttl=settings.CATALOG_TTL_SEC)
+
+
+async def resolve_tag_ids(codes: List[str]) -> tuple[List[int], List[str]]:
+    """
+    emotion tag code → id. returns (tag_ids, missing_codes)
+    모르는 code 가 있으면 새로 추가된 tag 일 수 있으므로 한 번만 재적재 후 다시 확인.
+    """
+    snapshot = await catalog.get()
+    missing = [c for c in codes if c not in snapshot.emotion_tags]
+    if missing and time.monotonic() - snapshot.loaded_at > _MISS_RELOAD_INTERVAL_SEC:
+        snapshot = await catalog.load(seen=snapshot, force=False)
+        missing = [c for c in codes if c not in snapshot.emotion_tags]
+
+    ids = [snapshot.emotion_tags[c]["id"] for c in dict.fromkeys(codes) if c in snapshot.emotion_tags]
+    return ids, missing
@@ -0,0 +1,139 @@
+# services/export_service.py
+
+from __future__ import annotations
+
+import json
+import zipfile
+import zlib
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from services.catalog_service import catalog
+from services.history_service import (
+    ACTION_LOGS,
+    JOURNAL_ENTRIES,
+    JOURNALS,
+    MOODS,
+    USER_BADGES,
+    HistorySpec,
+    iter_rows,
+)
+
+# 이 크기만큼 모이면 내보낸다 (gzip / zip 공통)
+FLUSH_BYTES = 64 * 1024
+
+
+def _mood_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    # mood_emotion_tags(emotion_tags(code)) embed → "tags": ["calm", ...]
+    links = row.pop("mood_emotion_tags", None) or []
+    row["tags"] = [
+        link["emotion_tags"]["code"]
+        for link in links
+        if link.get("emotion_tags")
+    ]
+    return row
+
+
+def _badge_row(row: Dict[str, Any], badge_codes: Dict[int, str]) -> Dict[str, Any]:
+    row["badge_code"] = badge_codes.get(row["badge_id"])
+    return row
+
+
+# (section, spec, 추가 select, row 변환)
+Section = Tuple[str, HistorySpec, Tuple[str, ...], Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]]
+
+
+async def _sections() -> List[Section]:
+    snapshot = await catalog.get()
+    badge_codes = {b["id"]: code for code, b in snapshot.badges.items()}
+    return [
+        ("moods", MOODS, ("created_at", "mood_emotion_tags(emotion_tags(code))"), _mood_row),
+        ("journals", JOURNALS, (), None),
+        ("journal_entries", JOURNAL_ENTRIES, (), None),
+        ("action_logs", ACTION_LOGS, (), None),
+        ("user_badges", USER_BADGES, (), lambda row: _badge_row(row, badge_codes)),
+    ]
+
+
+async def export_records(supabase, *, user_id: int) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    사용자 데이터 전체를 (section, row) 로 하나씩. table 별 keyset chunk 조회라 메모리는 chunk 하나.
+    """
+    stats = (
+        await supabase.table("user_stats").select("*").eq("user_id", user_id).execute()
+    ).data
+    for row in stats or []:
+        yield "user_stats", row
+
+    for name, spec, extra, transform in await _sections():
+        columns = list(dict.fromkeys([*spec.keys, *spec.default_fields, *extra]))
+        async for row, _ in iter_rows(supabase, spec, user_id=user_id, columns=columns):
+            yield name, transform(row) if transform else row
+
+
+def _line(data: Dict[str, Any]) -> bytes:
+    return (json.dumps(data, ensure_ascii=False, default=str) + "\n").encode()
+
+
+async def ndjson_chunks(supabase, *, user_id: int, gzip: bool = False) -> AsyncIterator[bytes]:
+    """한 줄 = {"type": section, "data": row}. gzip=True 면 on-the-fly gzip"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    buffer = bytearray()
+
+    async for section, row in export_records(supabase, user_id=user_id):
+        line = _line({"type": section, "data": row})
+        buffer += compressor.compress(line) if compressor else line
+        if len(buffer) >= FLUSH_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if compressor:
+        buffer += compressor.flush()
+    if buffer:
+        yield bytes(buffer)
+
+
+class _ZipSink:
+    """zipfile 이 쓰는 write-only stream. 쓴 bytes 를 모아 두었다가 generator 가 가져간다."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0
+
+    def write(self, data) -> int:
+        self.buffer += data
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+async def zip_chunks(supabase, *, user_id: int) -> AsyncIterator[bytes]:
+    """section 별 {section}.ndjson 파일을 담은 zip 을 stream (seek 없는 data descriptor 방식)"""
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+
+    current_name = None
+    current = None
+    async for section, row in export_records(supabase, user_id=user_id):
+        if section != current_name:
+            if current is not None:
+                current.close()
+            current_name = section
+            current = archive.open(f"{section}.ndjson", mode="w", force_zip64=True)
+        current.write(_line(row))
+        if len(sink.buffer) >= FLUSH_BYTES:
+            yield sink.drain()
+
+    if current is not None:
+        current.close()
+    archive.close()
+    yield sink.drain()
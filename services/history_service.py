@@ -0,0 +1,138 @@
+# services/history_service.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+# 한 번에 DB 에서 읽는 row 수 (NDJSON stream / export 의 chunk)
+CHUNK_SIZE = 200
+
+
+@dataclass(frozen=True)
+class HistorySpec:
+    """
+    사용자 history 목록 정의.
+    keys: 정렬 + cursor key (최신순, 마지막은 unique 한 id)
+    """
+    table: str
+    keys: Tuple[str, ...]
+    fields: Tuple[str, ...]             # ?fields= 로 고를 수 있는 컬럼
+    default_fields: Tuple[str, ...]
+
+
+JOURNAL_ENTRIES = HistorySpec(
+    table="journal_entries",
+    keys=("date", "created_at", "id"),
+    fields=("id", "date", "created_at", "type", "content"),
+    default_fields=("id", "date", "created_at", "type", "content"),
+)
+
+JOURNALS = HistorySpec(
+    table="journals",
+    keys=("created_at", "id"),
+    fields=("id", "created_at", "content"),
+    default_fields=("id", "created_at", "content"),
+)
+
+MOODS = HistorySpec(
+    table="moods",
+    keys=("date", "created_at", "id"),
+    fields=("id", "date", "created_at", "recorded_at", "main_valence", "energy", "trigger_type", "note"),
+    default_fields=("id", "date", "recorded_at", "main_valence", "energy", "trigger_type", "note"),
+)
+
+ACTION_LOGS = HistorySpec(
+    table="action_logs",
+    keys=("id",),
+    fields=("id", "action_id", "started_at", "completed_at", "feedback"),
+    default_fields=("id", "action_id", "started_at", "completed_at", "feedback"),
+)
+
+USER_BADGES = HistorySpec(
+    table="user_badges",
+    keys=("id",),
+    fields=("id", "badge_id", "earned_at"),
+    default_fields=("id", "badge_id", "earned_at"),
+)
+
+
+async def _fetch(
+    supabase,
+    spec: HistorySpec,
+    *,
+    user_id: int,
+    columns: List[str],
+    after: Optional[Dict[str, Any]],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    query = (
+        supabase.table(spec.table)
+        .select(", ".join(columns))
+        .eq("user_id", user_id)
+    )
+    if after is not None:
+        query = query.or_(keyset_filter(spec.keys, after))
+    for key in spec.keys:
+        query = query.order(key, desc=True)
+    res = await query.limit(limit).execute()
+    return res.data or []
+
+
+def _cursor_of(spec: HistorySpec, row: Dict[str, Any]) -> str:
+    return encode_cursor({k: row[k] for k in spec.keys})
+
+
+async def fetch_page(
+    supabase,
+    spec: HistorySpec,
+    *,
+    user_id: int,
+    columns: List[str],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    keyset pagination 한 페이지. offset 이 없으므로 몇 번째 페이지든 비용이 같다.
+    returns: {"items": [...], "next_cursor": str | None}
+    """
+    after = decode_cursor(cursor, spec.keys) if cursor else None
+    rows = await _fetch(supabase, spec, user_id=user_id, columns=columns, after=after, limit=limit + 1)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": rows,
+        "next_cursor": _cursor_of(spec, rows[-1]) if has_more and rows else None,
+    }
+
+
+async def iter_rows(
+    supabase,
+    spec: HistorySpec,
+    *,
+    user_id: int,
+    columns: List[str],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[Tuple[Dict[str, Any], str]]:
+    """
+    chunk 단위로 keyset 조회하며 row 를 하나씩 흘려보낸다 (메모리 = chunk 하나).
+    limit=None 이면 끝까지. yields: (row, 이 row 다음부터 이어 읽을 cursor)
+    """
+    after = decode_cursor(cursor, spec.keys) if cursor else None
+    remaining = limit
+
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        rows = await _fetch(supabase, spec, user_id=user_id, columns=columns, after=after, limit=size)
+        for row in rows:
+            yield row, _cursor_of(spec, row)
+        if len(rows) < size:
+            return
+        after = {k: rows[-1][k] for k in spec.keys}
+        if remaining is not None:
+            remaining -= len(rows)
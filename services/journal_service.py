@@ -0,0 +1,54 @@
+# services/journal_service.py
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict
+
+from services.calendar_service import bitmap_days, load_months
+from services.live_events import publish_xp
+from services.post_event_queue import post_event_queue
+
+
+async def get_entry_dates(supabase, *, user_id: int, month: str) -> list[str]:
+    """
+    해당 월에 journal entry 가 있는 날짜 목록 (정렬).
+    user_activity_months 의 day bitmap 1 row 로 (journal_entries scan 없음)
+    """
+    year, mon = map(int, month.split("-"))
+    months = await load_months(supabase, user_id=user_id, year=year, first_month=mon, last_month=mon)
+    bitmap = months.get(mon, {}).get("journal_days", 0)
+    return [date(year, mon, day).isoformat() for day in bitmap_days(bitmap)]
+
+
+async def write_journal(
+    supabase,
+    *,
+    user_id: int,
+    kind: str,              # journal | entry
+    content: str,
+    local_day: date,
+    entry_date: date | None = None,
+    entry_type: str | None = None,
+) -> Dict[str, Any]:
+    """
+    journal 저장 + XP / level / streak 를 write_journal RPC 1회로 (db/migrations/010_write_journal.sql).
+    returns: {"ok", "blocked", "id", "xp": apply_xp_event 결과}
+    """
+    res = await supabase.rpc("write_journal", {
+        "p_user_id": user_id,
+        "p_kind": kind,
+        "p_content": content,
+        "p_local_day": local_day.isoformat(),
+        "p_entry_date": entry_date.isoformat() if entry_date else None,
+        "p_entry_type": entry_type,
+    }).execute()
+    result = res.data
+
+    # 구독 중인 클라이언트에 push, badge 평가는 background 에서
+    if result["ok"]:
+        # SSE source 는 기존 그대로 (POST /journals = daily_journal)
+        publish_xp(user_id, "daily_journal" if kind == "journal" else "journal", result["xp"])
+        post_event_queue.enqueue(user_id, "journal")
+
+    return result
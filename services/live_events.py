@@ -0,0 +1,42 @@
+# services/live_events.py
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from config.settings import settings
+from core.pubsub import PubSubHub
+from services.stats_service import calculate_level
+
+# GET /events/stream 구독자 (user_id 별)
+live_hub = PubSubHub(
+    queue_size=settings.SSE_QUEUE_SIZE,
+    max_connections=settings.SSE_MAX_CONNECTIONS,
+)
+
+
+def publish_xp(user_id: int, source: str, result: Dict[str, Any]) -> None:
+    """XP 적용 결과 → xp (+ level_up) event. blocked 면 바뀐 게 없으므로 보내지 않는다."""
+    if result.get("blocked"):
+        return
+
+    live_hub.publish(user_id, "xp", {
+        "source": source,
+        "gained_xp": result["gained_xp"],
+        "total_xp": result["total_xp"],
+        "level": result["level"],
+        "streak_days": result["streak_days"],
+        "daily_xp": result["daily_xp"],
+    })
+
+    previous_level = calculate_level(result["total_xp"] - result["gained_xp"])
+    if result["level"] > previous_level:
+        live_hub.publish(user_id, "level_up", {
+            "level": result["level"],
+            "previous_level": previous_level,
+        })
+
+
+def publish_badges(user_id: int, codes: List[str]) -> None:
+    if codes:
+        live_hub.publish(user_id, "badge", {"earned": codes})
@@ -0,0 +1,71 @@
+# services/mood_analysis_cache.py
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from config.settings import settings
+from core.singleflight import SingleFlight
+from core.ttl_cache import TTLCache
+from schemas.mood import MoodAnalysisResponse
+from services.mood_service import get_mood_analysis
+from services.version_service import get_data_versions
+
+def _estimate_bytes(res: MoodAnalysisResponse) -> int:
+    # 대략적인 in-memory 크기 (model + point / tag 객체)
+    return 512 + 160 * len(res.points) + 64 * len(res.tagsSummary)
+
+
+# (user_id, range_key, utc_date, moods_version) → MoodAnalysisResponse
+# moods_version: user_data_versions.moods (db/migrations/007_user_data_versions.sql)
+#   → 어느 worker 에서 쓰든 다음 조회는 새 key 로 miss, 이전 version 결과는 TTL / LRU 로 정리
+_results = TTLCache(
+    maxsize=settings.MOOD_ANALYSIS_CACHE_MAX_ENTRIES,
+    ttl=settings.MOOD_ANALYSIS_CACHE_TTL_SEC,
+    maxweight=settings.MOOD_ANALYSIS_CACHE_MAX_BYTES,
+    weigher=_estimate_bytes,
+)
+_flights = SingleFlight()
+
+
+async def get_mood_analysis_cached(
+    *,
+    supabase,
+    user_id: int,
+    range_key: str,
+    moods_version: int | None = None,
+) -> MoodAnalysisResponse:
+    """
+    worker 단위 per-user 결과 캐시.
+    - hit: Supabase 조회 / Pydantic model 생성 없이 그대로 반환
+    - miss: 같은 key 동시 요청은 한 번만 계산 (single-flight)
+    - key 에 DB 의 moods version 이 들어가므로 별도 무효화 없음
+      moods_version 을 안 주면 여기서 읽는다 (ETag 와 맞추려면 호출자가 읽은 값을 넘길 것)
+    """
+    if moods_version is None:
+        moods_version = (await get_data_versions(supabase, user_id))["moods"]
+
+    utc_date = datetime.now(timezone.utc).date()
+    key = (user_id, range_key, utc_date, moods_version)
+
+    cached = _results.get(key)
+    if cached is not None:
+        return cached
+
+    async def compute():
+        res = await get_mood_analysis(
+            supabase=supabase,
+            user_id=user_id,
+            range_key=range_key,
+        )
+        _results.set(key, res)
+        return res
+
+    return await _flights.do(key, compute)
+
+
+def mood_analysis_cache_stats() -> dict:
+    return {
+        "results": _results.stats(),
+        "singleflight": _flights.stats(),
+    }
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+from postgrest.exceptions import APIError
+
+from core.compact import to_columns
 from schemas.mood import (
     MoodAnalysisResponse,
     MoodAnalysisSummary,
@@ -50,30 +53,144 @@ def _calc_summary_label(main_valence: int, energy: int) -> SummaryLabel:
     return SummaryLabel.NEUTRAL
 
 
+class UnknownTagCodes(ValueError):
+    def __init__(self, missing: List[str]):
+        super().__init__("Unknown tag codes")
+        self.missing = missing
+
+
 # -------------------------
-# main service
+# mood 저장 (submit_mood RPC 1회)
 # -------------------------
-def get_mood_analysis(
+async def create_mood(
     *,
     supabase,
     user_id: int,
-    range_key: str,
-) -> MoodAnalysisResponse:
-    start_date, end_date = _resolve_date_range(range_key)
+    day: date,
+    recorded_at: datetime,
+    main_valence: int,
+    energy: int,
+    trigger_type: Optional[str],
+    note: Optional[str],
+    tag_codes: List[str],
+) -> int:
+    """
+    mood + mood_emotion_tags 를 한 트랜잭션으로 저장 (db/migrations/005_submit_mood.sql).
+    모르는 tag code 가 있으면 아무것도 쓰지 않고 UnknownTagCodes.
+    """
+    try:
+        res = await supabase.rpc("submit_mood", {
+            "p_user_id": user_id,
+            "p_date": day.isoformat(),
+            "p_recorded_at": recorded_at.isoformat(),
+            "p_main_valence": main_valence,
+            "p_energy": energy,
+            "p_trigger_type": trigger_type,
+            "p_note": note,
+            "p_tag_codes": tag_codes,
+        }).execute()
+    except APIError as e:
+        if e.code == "22023":
+            raise UnknownTagCodes((e.details or "").split(","))
+        raise
+
+    return res.data
+
+
+# -------------------------
+# raw mood 조회 결과 → 공통 형태
+# -------------------------
+def _count_tag(tag_counts: Dict[str, int], tag_obj) -> None:
+    # supabase join 결과가 dict일 수도, list일 수도 있어서 둘 다 처리
+    if isinstance(tag_obj, list):
+        for t in tag_obj:
+            code = t.get("code") if isinstance(t, dict) else None
+            if code:
+                tag_counts[code] = tag_counts.get(code, 0) + 1
+    elif isinstance(tag_obj, dict):
+        code = tag_obj.get("code")
+        if code:
+            tag_counts[code] = tag_counts.get(code, 0) + 1
 
-    # 1️⃣ moods 조회
-    moods_res = (
+
+async def _load_today(supabase, user_id: int, day: date):
+    """
+    today: 그날 raw mood 전부 (tags 는 embed 로 같은 요청에서)
+    returns: (moods, tag_counts)
+    """
+    res = await (
         supabase.table("moods")
-        .select("id, date, recorded_at, main_valence, energy, note, trigger_type")
+        .select(
+            "id, date, recorded_at, main_valence, energy, note, trigger_type, "
+            "mood_emotion_tags(emotion_tags(code))"
+        )
+        .eq("user_id", user_id)
+        .eq("date", day.isoformat())
+        .order("recorded_at", desc=False)
+        .execute()
+    )
+
+    moods: List[Dict[str, Any]] = res.data or []
+    tag_counts: Dict[str, int] = {}
+    for m in moods:
+        for join in m.get("mood_emotion_tags") or []:
+            _count_tag(tag_counts, join.get("emotion_tags"))
+
+    return moods, tag_counts
+
+
+async def _load_rollups(supabase, user_id: int, start_date: date, end_date: date):
+    """
+    7d / 30d: mood_daily_rollups (하루 1 row, 그날 마지막 mood 가 point)
+    returns: (moods, tag_counts)
+    """
+    res = await (
+        supabase.table("mood_daily_rollups")
+        .select(
+            "date, last_mood_id, last_recorded_at, last_valence, last_energy, "
+            "last_note, last_trigger_type, tag_counts"
+        )
         .eq("user_id", user_id)
         .gte("date", start_date.isoformat())
         .lte("date", end_date.isoformat())
         .order("date", desc=False)
-        .order("recorded_at", desc=False)
         .execute()
     )
 
-    moods: List[Dict[str, Any]] = moods_res.data or []
+    moods: List[Dict[str, Any]] = []
+    tag_counts: Dict[str, int] = {}
+    for r in res.data or []:
+        moods.append({
+            "id": r["last_mood_id"],
+            "date": r["date"],
+            "recorded_at": r.get("last_recorded_at"),
+            "main_valence": r["last_valence"],
+            "energy": r["last_energy"],
+            "note": r.get("last_note"),
+            "trigger_type": r.get("last_trigger_type"),
+        })
+        for code, count in (r.get("tag_counts") or {}).items():
+            tag_counts[code] = tag_counts.get(code, 0) + count
+
+    return moods, tag_counts
+
+
+# -------------------------
+# main service
+# -------------------------
+async def get_mood_analysis(
+    *,
+    supabase,
+    user_id: int,
+    range_key: str,
+) -> MoodAnalysisResponse:
+    start_date, end_date = _resolve_date_range(range_key)
+
+    # 1️⃣ moods 조회 (today: raw / 7d·30d: daily rollup, 최대 30 row)
+    if range_key == "today":
+        moods, tag_counts = await _load_today(supabase, user_id, end_date)
+    else:
+        moods, tag_counts = await _load_rollups(supabase, user_id, start_date, end_date)
 
     if not moods:
         # 기록 없는 기간
@@ -90,7 +207,7 @@ def get_mood_analysis(
             todayMood=None,
         )
 
-    # 2️⃣ points 생성 (raw mood = 1 point)
+    # 2️⃣ points 생성 (today: raw mood = 1 point / 그 외: 하루 = 1 point)
     points = [
         MoodAnalysisPoint(
             date=m["date"],
@@ -115,34 +232,6 @@ def get_mood_analysis(
     )
 
     # 4️⃣ tags summary
-    mood_ids = [m["id"] for m in moods]
-
-    tags_res = (
-        supabase.table("mood_emotion_tags")
-        .select("emotion_tags(code)")
-        .in_("mood_id", mood_ids)
-        .execute()
-    )
-
-    tag_counts: Dict[str, int] = {}
-    for row in tags_res.data or []:
-        tag_obj = row.get("emotion_tags")
-        if not tag_obj:
-            continue
-
-        # supabase join 결과가 dict일 수도, list일 수도 있어서 둘 다 처리
-        if isinstance(tag_obj, list):
-            for t in tag_obj:
-                code = t.get("code") if isinstance(t, dict) else None
-                if not code:
-                    continue
-                tag_counts[code] = tag_counts.get(code, 0) + 1
-        elif isinstance(tag_obj, dict):
-            code = tag_obj.get("code")
-            if not code:
-                continue
-            tag_counts[code] = tag_counts.get(code, 0) + 1
-
     tags_summary = [
         MoodTagSummaryItem(code=code, count=count)
         for code, count in sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
@@ -164,3 +253,30 @@ def get_mood_analysis(
         tagsSummary=tags_summary,
         todayMood=today_mood,
     )
+
+
+# -------------------------
+# columnar 응답 (Accept: application/vnd.weavemo.columnar+json / ?format=columnar)
+# -------------------------
+def to_columnar(res: MoodAnalysisResponse) -> Dict[str, Any]:
+    """points / tagsSummary 를 column 배열로. 캐시된 model 을 다시 검증하지 않고 attribute 만 읽는다"""
+    return {
+        "range": res.range,
+        "summary": {
+            "mainValence": res.summary.mainValence,
+            "energy": res.summary.energy,
+            "label": res.summary.label.value,
+            "hasNote": res.summary.hasNote,
+        },
+        "points": to_columns(res.points, ("date", "mainValence", "energy", "recordedAt")),
+        "tagsSummary": to_columns(res.tagsSummary, ("code", "count")),
+        "todayMood": (
+            {
+                "moodId": res.todayMood.moodId,
+                "note": res.todayMood.note,
+                "triggerType": res.todayMood.triggerType,
+            }
+            if res.todayMood is not None
+            else None
+        ),
+    }
@@ -0,0 +1,269 @@
+# services/mood_trends_service.py
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.downsample import lttb_indices
+
+RANGE_DAYS = {"7d": 7, "30d": 30, "90d": 90, "365d": 365}
+# custom 최대 기간 (rollup row 수 ↔ PostgREST max rows)
+MAX_CUSTOM_DAYS = 730
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+MAX_TAGS = 20
+
+
+def resolve_trend_range(
+    range_key: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> tuple[date, date]:
+    """7d / 30d / 90d / 365d: 오늘(UTC)까지, custom: from ~ to (포함). 잘못된 값은 ValueError"""
+    if range_key == "custom":
+        if date_from is None or date_to is None:
+            raise ValueError("custom range requires from and to")
+        if date_from > date_to:
+            raise ValueError("from must be on or before to")
+        if (date_to - date_from).days + 1 > MAX_CUSTOM_DAYS:
+            raise ValueError(f"custom range is limited to {MAX_CUSTOM_DAYS} days")
+        return date_from, date_to
+
+    if range_key not in RANGE_DAYS:
+        raise ValueError("Invalid range value")
+    today = datetime.now(timezone.utc).date()
+    return today - timedelta(days=RANGE_DAYS[range_key] - 1), today
+
+
+async def _load_rollups(supabase, user_id: int, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    # 하루 1 row (db/migrations/006_mood_daily_rollups.sql), 365d 도 최대 ~370 row
+    res = await (
+        supabase.table("mood_daily_rollups")
+        .select("date, mood_count, valence_sum, energy_sum, last_trigger_type, tag_counts")
+        .eq("user_id", user_id)
+        .gte("date", start_date.isoformat())
+        .lte("date", end_date.isoformat())
+        .order("date", desc=False)
+        .execute()
+    )
+    return res.data or []
+
+
+def _round(values: np.ndarray, digits: int = 2) -> List[Optional[float]]:
+    # NaN → None (JSON null)
+    rounded = np.round(values.astype(np.float64), digits)
+    return [None if np.isnan(v) else v for v in rounded.tolist()]
+
+
+def _num(value: float, digits: int = 3) -> Optional[float]:
+    return None if value is None or not np.isfinite(value) else round(float(value), digits)
+
+
+def _corr(a: np.ndarray, b: np.ndarray) -> Optional[float]:
+    if len(a) < 3 or a.std() == 0 or b.std() == 0:
+        return None
+    return _num(np.corrcoef(a, b)[0, 1])
+
+
+def _empty(range_key: str, start_date: date, end_date: date, window: int) -> Dict[str, Any]:
+    return {
+        "range": range_key,
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "days": 0,
+        "moods": 0,
+        "window": window,
+        "points": {"date": [], "valence": [], "energy": [], "valenceAvg": [], "energyAvg": []},
+        "summary": None,
+        "weekday": None,
+        "distribution": None,
+        "triggers": [],
+        "tags": [],
+    }
+
+
+def compute_trends(
+    rows: List[Dict[str, Any]],
+    *,
+    range_key: str,
+    start_date: date,
+    end_date: date,
+    window: int,
+    max_points: int,
+) -> Dict[str, Any]:
+    """
+    daily rollup row → 추세 (column 배열, NumPy 벡터 연산).
+    rows 는 start_date - (window - 1) 부터 (첫날 rolling 평균용).
+    - 일 평균 = valence_sum / mood_count (하루 여러 기록은 평균)
+    - rolling 평균은 기록 수 가중 (window 일 안의 모든 mood 평균)
+    - points 는 LTTB 로 max_points 개 이하
+    """
+    # 1️⃣ 날짜 축 (calendar 일 단위 dense 배열, 기록 없는 날 = 0)
+    origin = start_date - timedelta(days=window - 1)
+    n_days = (end_date - origin).days + 1
+
+    day_idx = np.array([(date.fromisoformat(str(r["date"])[:10]) - origin).days for r in rows], dtype=np.int64)
+    counts = np.zeros(n_days, dtype=np.float64)
+    valence_sum = np.zeros(n_days, dtype=np.float64)
+    energy_sum = np.zeros(n_days, dtype=np.float64)
+    if rows:
+        counts[day_idx] = [r["mood_count"] or 0 for r in rows]
+        valence_sum[day_idx] = [r["valence_sum"] or 0 for r in rows]
+        energy_sum[day_idx] = [r["energy_sum"] or 0 for r in rows]
+
+    # 2️⃣ rolling 평균 (누적합 차이)
+    def rolling(values: np.ndarray) -> np.ndarray:
+        csum = np.concatenate(([0.0], np.cumsum(values)))
+        return csum[window:] - csum[:-window]
+
+    roll_count = rolling(counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        roll_valence = rolling(valence_sum) / roll_count
+        roll_energy = rolling(energy_sum) / roll_count
+
+    # 여기부터는 요청 기간만 (rolling 결과는 이미 start_date 부터 정렬됨)
+    offset = window - 1
+    counts, valence_sum, energy_sum = counts[offset:], valence_sum[offset:], energy_sum[offset:]
+
+    has = counts > 0
+    if not has.any():
+        return _empty(range_key, start_date, end_date, window)
+
+    days = np.flatnonzero(has)
+    n = counts[days]
+    valence = valence_sum[days] / n
+    energy = energy_sum[days] / n
+
+    # 3️⃣ points: 기록 있는 날만, valence 모양 기준 LTTB
+    keep = days[lttb_indices(days, valence, max_points)] if len(days) > max_points else days
+    keep_pos = np.searchsorted(days, keep)
+    points = {
+        "date": [(start_date + timedelta(days=int(d))).isoformat() for d in keep],
+        "valence": _round(valence[keep_pos]),
+        "energy": _round(energy[keep_pos]),
+        "valenceAvg": _round(roll_valence[keep]),
+        "energyAvg": _round(roll_energy[keep]),
+    }
+
+    # 4️⃣ summary: 기간 평균 (mood 가중), 표준편차, 30일당 기울기, valence-energy 상관
+    total = n.sum()
+    summary = {
+        "valence": _num(valence_sum.sum() / total),
+        "energy": _num(energy_sum.sum() / total),
+        "valenceStd": _num(valence.std()),
+        "energyStd": _num(energy.std()),
+        "valenceSlope30d": _num(np.polyfit(days, valence, 1)[0] * 30) if len(days) >= 3 else None,
+        "energySlope30d": _num(np.polyfit(days, energy, 1)[0] * 30) if len(days) >= 3 else None,
+        "valenceEnergyCorr": _corr(valence, energy),
+    }
+
+    # 5️⃣ 요일별 (월=0), mood 가중 평균
+    weekday_of = (days + start_date.weekday()) % 7
+    wd_count = np.bincount(weekday_of, weights=n, minlength=7)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weekday = {
+            "labels": list(WEEKDAYS),
+            "valence": _round(np.bincount(weekday_of, weights=valence_sum[days], minlength=7) / wd_count),
+            "energy": _round(np.bincount(weekday_of, weights=energy_sum[days], minlength=7) / wd_count),
+            "count": wd_count.astype(np.int64).tolist(),
+        }
+
+    # 6️⃣ 분포: 일 평균을 반올림한 값별 일수 (valence -2..2, energy 1..5)
+    distribution = {
+        "valence": np.bincount(np.clip(np.rint(valence), -2, 2).astype(np.int64) + 2, minlength=5).tolist(),
+        "energy": np.bincount(np.clip(np.rint(energy), 1, 5).astype(np.int64) - 1, minlength=5).tolist(),
+        "valenceLabels": [-2, -1, 0, 1, 2],
+        "energyLabels": [1, 2, 3, 4, 5],
+    }
+
+    # rows 중 요청 기간 안의 것 (days 와 같은 순서)
+    period_rows = [r for r, d in zip(rows, day_idx) if d >= offset and (r["mood_count"] or 0) > 0]
+    overall = valence.mean()
+
+    # 7️⃣ trigger_type 별 (그날 마지막 mood 의 trigger 기준)
+    triggers = []
+    trigger_of = np.array([r.get("last_trigger_type") or "" for r in period_rows], dtype=object)
+    codes, inverse = np.unique(trigger_of, return_inverse=True)
+    t_days = np.bincount(inverse, minlength=len(codes))
+    t_valence = np.bincount(inverse, weights=valence, minlength=len(codes)) / t_days
+    t_energy = np.bincount(inverse, weights=energy, minlength=len(codes)) / t_days
+    for i in np.argsort(-t_days, kind="stable"):
+        if codes[i]:
+            triggers.append({
+                "type": codes[i],
+                "days": int(t_days[i]),
+                "valence": _num(t_valence[i]),
+                "energy": _num(t_energy[i]),
+                "valenceDelta": _num(t_valence[i] - overall),
+            })
+
+    # 8️⃣ tag 별: 그 tag 가 있었던 날 평균, 없던 날 대비 차이, 점이연 상관 (tag 유무 ↔ 일 평균 valence)
+    tag_codes = sorted({code for r in period_rows for code in (r.get("tag_counts") or {})})
+    tags = []
+    if tag_codes:
+        col = {code: j for j, code in enumerate(tag_codes)}
+        present = np.zeros((len(period_rows), len(tag_codes)), dtype=np.float64)
+        for i, r in enumerate(period_rows):
+            for code, cnt in (r.get("tag_counts") or {}).items():
+                if cnt:
+                    present[i, col[code]] = 1.0
+
+        tag_days = present.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            with_tag = present.T @ valence / tag_days
+            without_tag = (1 - present).T @ valence / (len(valence) - tag_days)
+            pc = present - present.mean(axis=0)
+            vc = valence - overall
+            corr = (pc.T @ vc) / (np.sqrt((pc ** 2).sum(axis=0)) * np.sqrt((vc ** 2).sum()))
+
+        for j in np.argsort(-tag_days, kind="stable")[:MAX_TAGS]:
+            tags.append({
+                "code": tag_codes[j],
+                "days": int(tag_days[j]),
+                "valence": _num(with_tag[j]),
+                "valenceDelta": _num(with_tag[j] - without_tag[j]),
+                "corr": _num(corr[j]) if len(valence) >= 3 else None,
+            })
+
+    return {
+        "range": range_key,
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "days": int(len(days)),
+        "moods": int(total),
+        "window": window,
+        "points": points,
+        "summary": summary,
+        "weekday": weekday,
+        "distribution": distribution,
+        "triggers": triggers,
+        "tags": tags,
+    }
+
+
+async def get_mood_trends(
+    supabase,
+    *,
+    user_id: int,
+    range_key: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    window: int = 7,
+    max_points: int = 120,
+) -> Dict[str, Any]:
+    """
+    장기 mood 추세 (mood_daily_rollups 조회 1회 + NumPy 계산).
+    points 는 {"date": [...], "valence": [...], ...} column 배열 (point 별 객체 없음)
+    """
+    start_date, end_date = resolve_trend_range(range_key, date_from, date_to)
+    rows = await _load_rollups(supabase, user_id, start_date - timedelta(days=window - 1), end_date)
+    return compute_trends(
+        rows,
+        range_key=range_key,
+        start_date=start_date,
+        end_date=end_date,
+        window=window,
+        max_points=max_points,
+    )
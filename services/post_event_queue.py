@@ -0,0 +1,187 @@
+# services/post_event_queue.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable, List, Set, Tuple
+
+from config.settings import settings
+from core.request_scope import request_scope
+from db.database import get_supabase
+from services.badge_service import check_badges
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PostEvent:
+    user_id: int
+    source: str        # action | journal | mood
+    attempt: int = 0
+
+
+Handler = Callable[[PostEvent], Awaitable[None]]
+
+
+async def evaluate_badges(event: PostEvent) -> None:
+    supabase = await get_supabase()
+    await check_badges(supabase, user_id=event.user_id, source=event.source)
+
+
+# write 후 처리할 파생 작업들 (모두 멱등이어야 한다: 재시도 / 중복 event 가능)
+HANDLERS: Tuple[Handler, ...] = (
+    evaluate_badges,
+)
+
+
+class PostEventQueue:
+    """
+    write endpoint 이후 파생 작업(badge 평가 등)을 background 에서 처리하는 queue (worker 단위).
+
+    - enqueue(): put_nowait 만 하고 바로 리턴 → write 응답 latency 는 작업 수와 무관
+    - bounded: 가득 차면 event 를 버린다 (dropped). 작업이 멱등 / 다음 event 나
+      scripts/backfill_badges.py 로 다시 평가되므로 write 를 막지 않는 쪽을 택함
+    - 같은 (user_id, source) 가 이미 대기 중이면 합친다
+    - 실패 시 지수 backoff 로 max_retries 까지 재시도
+    - stop(): 남은 event 처리 후 종료
+
+    별도 process worker 는 두지 않는다: handler 는 I/O 위주(stats 조회 + upsert 1회)라
+    process 를 나눠 얻을 CPU 이득이 없고, 새 뱃지 알림(publish_badges)은 이 process 의
+    live_hub 로 나가므로 다른 process 에서 평가하면 SSE 구독자에게 전달되지 않는다.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        workers: int,
+        max_retries: int,
+        retry_base_delay: float,
+        handlers: Tuple[Handler, ...] = HANDLERS,
+    ):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.handlers = handlers
+
+        self._queue: asyncio.Queue[PostEvent] | None = None
+        self._queued: Set[Tuple[int, str]] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._retry_handles: Set[asyncio.TimerHandle] = set()
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.processed = 0
+        self.retries = 0
+        self.failed = 0
+
+    def enqueue(self, user_id: int, source: str) -> bool:
+        key = (user_id, source)
+        if key in self._queued:
+            self.coalesced += 1
+            return True
+        return self._put(PostEvent(user_id=user_id, source=source))
+
+    def _put(self, event: PostEvent) -> bool:
+        if self._queue is None:
+            # lifespan 밖 (script 등): 처리할 worker 가 없음
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("post-event queue full, dropped %s", event)
+            return False
+        self._queued.add((event.user_id, event.source))
+        self.enqueued += 1
+        return True
+
+    def _retry_later(self, event: PostEvent) -> None:
+        delay = self.retry_base_delay * (2 ** event.attempt)
+        retry = replace(event, attempt=event.attempt + 1)
+
+        def fire():
+            self._retry_handles.discard(handle)
+            self._put(retry)
+
+        handle = asyncio.get_running_loop().call_later(delay, fire)
+        self._retry_handles.add(handle)
+
+    async def _process(self, event: PostEvent) -> None:
+        try:
+            # handler 안의 DataLoader memo 를 event 단위로
+            with request_scope():
+                for handler in self.handlers:
+                    await handler(event)
+        except Exception:
+            if event.attempt < self.max_retries:
+                self.retries += 1
+                self._retry_later(event)
+            else:
+                self.failed += 1
+                logger.exception("post-event failed after %d attempts: %s", event.attempt + 1, event)
+            return
+        self.processed += 1
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            event = await queue.get()
+            # 처리 시작 후 들어온 같은 key event 는 다시 평가해야 하므로 여기서 해제
+            self._queued.discard((event.user_id, event.source))
+            try:
+                await self._process(event)
+            finally:
+                queue.task_done()
+
+    def start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self._queue is None:
+            return
+
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("post-event queue stop: %d events left", self._queue.qsize())
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._queued.clear()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "workers": self.workers,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "processed": self.processed,
+            "retries": self.retries,
+            "pending_retries": len(self._retry_handles),
+            "failed": self.failed,
+        }
+
+
+post_event_queue = PostEventQueue(
+    maxsize=settings.POST_EVENT_QUEUE_MAX_SIZE,
+    workers=settings.POST_EVENT_WORKERS,
+    max_retries=settings.POST_EVENT_MAX_RETRIES,
+    retry_base_delay=settings.POST_EVENT_RETRY_BASE_DELAY_SEC,
+)
@@ -0,0 +1,90 @@
+# services/search_service.py
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+# 검색 대상 (db/migrations/013_journal_search.sql)
+SOURCES = ("journals", "journal_entries")
+
+# snippet: 첫 일치 위치 앞뒤로 자르는 글자 수
+SNIPPET_BEFORE = 30
+SNIPPET_LENGTH = 120
+MAX_TERMS = 8
+
+
+def split_terms(query: str) -> List[str]:
+    # 공백 기준, 중복 제거 (순서 유지)
+    return list(dict.fromkeys(query.split()))[:MAX_TERMS]
+
+
+def make_snippet(content: str, terms: List[str]) -> Dict[str, Any]:
+    """
+    첫 일치 위치 주변 SNIPPET_LENGTH 글자 + 그 안의 일치 구간 [[start, end], ...] (text 기준 offset).
+    한국어는 형태소 분리 없이 부분 문자열로 찾는다 (DB 의 ilike 와 같은 기준).
+    """
+    lowered = content.lower()
+    lowered_terms = [t.lower() for t in terms]
+
+    positions = [p for p in (lowered.find(t) for t in lowered_terms) if p >= 0]
+    first = min(positions) if positions else 0
+
+    start = max(0, first - SNIPPET_BEFORE)
+    end = min(len(content), start + SNIPPET_LENGTH)
+    start = max(0, end - SNIPPET_LENGTH)
+
+    prefix = "…" if start > 0 else ""
+    window = lowered[start:end]
+    matches = []
+    for term in lowered_terms:
+        pos = window.find(term)
+        while pos >= 0:
+            matches.append([len(prefix) + pos, len(prefix) + pos + len(term)])
+            pos = window.find(term, pos + len(term))
+    matches.sort()
+
+    return {
+        "text": prefix + content[start:end] + ("…" if end < len(content) else ""),
+        "matches": matches,
+    }
+
+
+async def search_journals(
+    supabase,
+    *,
+    user_id: int,
+    query: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = 20,
+    sources: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    journals + journal_entries 본문 검색. search_journals RPC 1회 (pg_trgm index, 사용자 범위).
+    모든 검색어를 포함하는 글만, 관련도 → 최신순 top-k. 본문 대신 snippet 을 돌려준다.
+    """
+    terms = split_terms(query)
+    if not terms:
+        return []
+
+    res = await supabase.rpc("search_journals", {
+        "p_user_id": user_id,
+        "p_query": " ".join(terms),
+        "p_from": date_from.isoformat() if date_from else None,
+        "p_to": date_to.isoformat() if date_to else None,
+        "p_limit": limit,
+        "p_sources": sources,
+    }).execute()
+
+    return [
+        {
+            "source": row["source"],
+            "id": row["id"],
+            "date": row["date"],
+            "created_at": row["created_at"],
+            "rank": row["rank"],
+            "snippet": make_snippet(row["content"] or "", terms),
+        }
+        for row in res.data or []
+    ]
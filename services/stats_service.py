@@ -2,9 +2,15 @@
 
 from datetime import date
 
+from core.dataloader import invalidate_rows, rows_loader
+from services.user_service import provision_user
+from utils.timezone import user_today_range_utc
+
 DAILY_XP_CAP = 150
 LEVEL_CUTOFFS = [0,100,200,300,400,500,600,700,800,900]
 
+# ⚠️ 규칙 변경 시 db/migrations/003_xp_events.sql (apply_xp_event, xp_ledger_totals) 도 같이 수정
+
 
 def calculate_level(xp: int) -> int:
     level = 1
@@ -20,9 +26,117 @@ def apply_daily_xp(daily_xp: int, amount: int):
     return daily_xp + gained, gained
 
 
+def _as_date(value):
+    # supabase 는 date 컬럼을 "YYYY-MM-DD" 문자열로 돌려준다
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
 def calc_streak(last_date, today: date):
+    last_date = _as_date(last_date)
     if last_date == today:
         return 0
     if last_date == today.fromordinal(today.toordinal() - 1):
         return 1
     return -1
+
+
+def apply_xp_event(
+    row: dict,
+    *,
+    source: str,
+    amount: int,
+    today: date,
+    duplicate: bool = False,
+):
+    """
+    user_stats row 에 XP 이벤트 1건을 적용한다 (apply_xp_event RPC 의 in-memory 버전).
+    duplicate: xp_events 에 (source, source_id, today) 이벤트가 이미 있는지
+    returns: (user_stats update | None, response)
+    """
+    today_str = today.isoformat()
+    daily_xp = row["daily_xp"] if str(row.get("daily_xp_date")) == today_str else 0
+    new_daily_xp, gained = apply_daily_xp(daily_xp, amount)
+
+    # ── 하루 1회 가드 / DAILY XP CAP ──────────
+    if duplicate or gained == 0:
+        return None, {
+            "gained_xp": 0,
+            "blocked": True,
+            "reason": "duplicate" if duplicate else "daily_cap",
+            "total_xp": row["xp"],
+            "level": row["level"],
+            "streak_days": row["streak_days"],
+            "daily_xp": daily_xp,
+        }
+
+    new_xp = row["xp"] + gained
+    new_level = calculate_level(new_xp)
+
+    # ── STREAK ─────────────────────
+    delta = calc_streak(row.get("last_checkin_date"), today)
+    new_streak = row["streak_days"]
+    if delta == 1:
+        new_streak += 1
+    elif delta == -1:
+        new_streak = 1
+
+    update = {
+        "xp": new_xp,
+        "level": new_level,
+        "daily_xp": new_daily_xp,
+        "daily_xp_date": today_str,
+        "streak_days": new_streak,
+        "last_checkin_date": today_str,
+    }
+    if source == "mood":
+        update["daily_mood_xp_date"] = today_str
+    if source == "journal":
+        update["daily_journal_xp_date"] = today_str
+
+    return update, {
+        "gained_xp": gained,
+        "total_xp": new_xp,
+        "level": new_level,
+        "streak_days": new_streak,
+        "daily_xp": new_daily_xp,
+        "blocked": False,
+    }
+
+
+async def get_profile(supabase, *, user_id: int, auth_uid: str, email: str | None) -> dict:
+    """GET /stats/profile 응답"""
+    # user_stats row 는 get_current_user 의 provision_user 에서 이미 보장됨
+    rows = await rows_loader(supabase, "user_stats", "user_id").load(user_id)
+    if not rows:
+        await provision_user(supabase, auth_uid=auth_uid, email=email)
+        invalidate_rows("user_stats", user_id)
+        rows = await rows_loader(supabase, "user_stats", "user_id").load(user_id)
+
+    row = rows[0]
+
+    return {
+        "level": row["level"],
+        "xp": row["xp"],
+        "streak_days": row["streak_days"],
+        "daily_xp": row["daily_xp"],
+        "daily_xp_cap": DAILY_XP_CAP,
+        "plan": row["plan"],
+    }
+
+
+async def get_completed_action_ids(supabase, *, user_id: int, tz_offset_min: int) -> list[int]:
+    """사용자 로컬 '오늘' 시작한 action id 목록"""
+    _, start, end = user_today_range_utc(tz_offset_min)
+
+    res = await (
+        supabase.table("action_logs")
+        .select("action_id")
+        .eq("user_id", user_id)
+        .gte("started_at", start)
+        .lte("started_at", end)
+        .execute()
+    )
+
+    return [r["action_id"] for r in res.data] if res.data else []
@@ -0,0 +1,158 @@
+# services/sync_service.py
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from schemas.sync import JournalEntrySyncEvent, MoodSyncEvent, XpSyncEvent
+from services.catalog_service import resolve_tag_ids
+from services.live_events import publish_xp
+from services.post_event_queue import post_event_queue
+from services.stats_service import calculate_level
+from services.xp_service import XP_SOURCES
+
+
+def _xp_source(event) -> str:
+    if isinstance(event, JournalEntrySyncEvent):
+        return "journal"
+    # /stats/xp/increment 와 같은 규칙
+    source = event.source.lower()
+    return "journal" if source == "journals" else source
+
+
+def _times(event) -> Tuple[datetime, str]:
+    """
+    returns: (UTC 시각, 사용자 로컬 날짜)
+    로컬 날짜는 occurredAt 의 offset 이 아니라 tzOffsetMin 기준 (온라인 endpoint 의 user_local_date 와 같은 날)
+    """
+    user_tz = timezone(timedelta(minutes=event.tzOffsetMin))
+    occurred_at = event.occurredAt
+    if occurred_at.tzinfo is None:
+        occurred_at = occurred_at.replace(tzinfo=user_tz)
+    local_day = occurred_at.astimezone(user_tz).date()
+    return occurred_at.astimezone(timezone.utc), local_day.isoformat()
+
+
+async def _prepare(events) -> Tuple[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+    """
+    DB 에 보내기 전 검증 / 변환 / 시간순 정렬 (DB 조회 없음).
+    returns: (sync_events RPC payload, 여기서 거절된 event index → result)
+    """
+    rejected: Dict[int, Dict[str, Any]] = {}
+    payload: List[Tuple[datetime, Dict[str, Any]]] = []
+    seen = set()
+
+    for i, event in enumerate(events):
+        if event.clientId in seen:
+            rejected[i] = {"status": "rejected", "reason": "duplicate_client_id"}
+            continue
+        seen.add(event.clientId)
+
+        recorded_at, local_day = _times(event)
+        item: Dict[str, Any] = {
+            "client_id": event.clientId,
+            "recorded_at": recorded_at.isoformat(),
+            "local_day": local_day,
+        }
+
+        if isinstance(event, MoodSyncEvent):
+            tag_codes = event.tagIds or []
+            _, missing = await resolve_tag_ids(tag_codes)
+            if missing:
+                rejected[i] = {
+                    "status": "rejected", "reason": "unknown_tag_codes", "missing": missing,
+                }
+                continue
+            item.update({
+                "type": "mood",
+                # POST /mood/submit 와 같이 UTC 날짜
+                "date": recorded_at.date().isoformat(),
+                "main_valence": event.mainValence,
+                "energy": event.energy,
+                "trigger_type": event.triggerType,
+                "note": event.note,
+                "tag_codes": tag_codes,
+            })
+
+        elif isinstance(event, JournalEntrySyncEvent):
+            item.update({
+                "type": "journal_entry",
+                "date": event.date.isoformat(),
+                "content": event.content,
+                "entry_type": event.entryType,
+            })
+
+        elif isinstance(event, XpSyncEvent):
+            source = _xp_source(event)
+            if source not in XP_SOURCES or (source == "action" and event.actionId is None):
+                rejected[i] = {"status": "rejected", "reason": "invalid_xp_event"}
+                continue
+            item.update({
+                "type": "xp",
+                "source": source,
+                "amount": event.amount,
+                "source_id": event.actionId if source == "action" else 0,
+            })
+
+        payload.append((recorded_at, item))
+
+    # XP / streak 는 시간순으로 적용해야 한다 (같은 시각이면 요청 순서)
+    payload.sort(key=lambda p: p[0])
+    return [item for _, item in payload], rejected
+
+
+async def ingest_events(supabase, *, user_id: int, events) -> Dict[str, Any]:
+    """
+    오프라인 event batch 저장 (sync_events RPC 1회, db/migrations/009_sync_events.sql).
+    결과는 요청 순서대로, client_id 별 status: ok | duplicate | rejected
+    """
+    payload, rejected = await _prepare(events)
+
+    stored: Dict[str, Dict[str, Any]] = {}
+    stats = None
+    if payload:
+        res = await supabase.rpc("sync_events", {
+            "p_user_id": user_id,
+            "p_events": payload,
+        }).execute()
+        stored = res.data["results"]
+        stats = res.data["stats"]
+
+    results = []
+    fresh = []
+    for i, event in enumerate(events):
+        result = rejected.get(i) or stored[event.clientId]
+        results.append({"clientId": event.clientId, **result})
+        if result.get("status") == "ok":
+            fresh.append((event, result))
+
+    # 후처리: 이번에 새로 저장된 것만
+    # badge 평가는 저장된 event 종류 기준 (mood / 접힌 구간 journal 도 XP 없이 저장됨)
+    sources = set()
+    gained: Dict[str, int] = {}
+    for event, result in fresh:
+        source = "mood" if isinstance(event, MoodSyncEvent) else _xp_source(event)
+        sources.add(source)
+        xp = result.get("xp")
+        if xp and not xp.get("blocked"):
+            gained[source] = gained.get(source, 0) + xp["gained_xp"]
+    for source in sources:
+        post_event_queue.enqueue(user_id, source)
+
+    # event 별 XP 결과의 level / streak 는 rebuild_user_stats 전 값일 수 있으므로
+    # 최종 stats 기준으로 source 별 1건씩 (total_xp 는 누적해서 level_up 이 한 번만 나가게)
+    if gained:
+        total_xp = stats["xp"] - sum(gained.values())
+        for source, amount in gained.items():
+            total_xp += amount
+            publish_xp(user_id, source, {
+                "gained_xp": amount,
+                "total_xp": total_xp,
+                "level": calculate_level(total_xp),
+                "streak_days": stats["streak_days"],
+                "daily_xp": stats["daily_xp"],
+            })
+
+    return {"results": results, "stats": stats}
+
@@ -0,0 +1,15 @@
+# services/user_service.py
+
+
+async def provision_user(supabase, *, auth_uid: str, email: str | None) -> int:
+    """
+    users + user_stats get-or-create (db/migrations/001_provision_user.sql).
+    한 번의 RPC 호출로 내부 BIGINT user_id 를 돌려준다.
+    """
+    res = await supabase.rpc("provision_user", {
+        "p_auth_uid": auth_uid,
+        "p_email": email,
+        "p_nickname": email.split("@")[0] if email else "user",
+    }).execute()
+
+    return res.data
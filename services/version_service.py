@@ -0,0 +1,26 @@
+# services/version_service.py
+
+from __future__ import annotations
+
+from typing import Dict
+
+from core.dataloader import rows_loader
+
+# user_data_versions 컬럼 (db/migrations/007_user_data_versions.sql)
+DOMAINS = ("stats", "moods", "journal_entries", "action_logs")
+
+
+async def get_data_versions(supabase, user_id: int) -> Dict[str, int]:
+    """
+    사용자별 도메인 쓰기 카운터 (PK 조회 1회).
+    row 가 없으면 아직 trigger 가 돈 적 없는 사용자 → 전부 0.
+
+    ⚠️ 반드시 본 조회보다 먼저 읽을 것.
+       (사이에 write 가 끼면 body 가 version 보다 새것 → 다음 요청에서 다시 200, stale 304 는 없음)
+    """
+    rows = await rows_loader(
+        supabase, "user_data_versions", "user_id", "user_id, " + ", ".join(DOMAINS)
+    ).load(user_id)
+    if not rows:
+        return dict.fromkeys(DOMAINS, 0)
+    return {d: rows[0].get(d) or 0 for d in DOMAINS}
@@ -0,0 +1,114 @@
+# services/xp_service.py
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from fastapi import Depends
+
+from db.database import get_supabase
+from services.stats_service import apply_xp_event
+
+# 클라이언트가 직접 적립할 수 있는 source (/stats/xp/increment, /sync/batch).
+# daily_journal 은 POST /journals 전용 가드라 제외
+XP_SOURCES = ("journal", "mood", "action")
+
+
+class SupabaseXpStore:
+    """
+    XP 이벤트 1건 = apply_xp_event RPC 1회 (db/migrations/003_xp_events.sql).
+    ledger 조건부 insert(하루 1회 가드) / cap / level / streak / action_logs insert 가
+    DB 트랜잭션 하나에서 처리된다.
+    """
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    async def apply(
+        self,
+        *,
+        user_id: int,
+        source: str,
+        amount: int,
+        local_day: date,
+        source_id: int = 0,
+    ) -> Dict[str, Any]:
+        res = await self.supabase.rpc("apply_xp_event", {
+            "p_user_id": user_id,
+            "p_source": source,
+            "p_amount": amount,
+            "p_source_id": source_id,
+            "p_local_day": local_day.isoformat(),
+        }).execute()
+        return res.data
+
+
+class InMemoryXpStore:
+    """
+    테스트용 in-memory 구현. SupabaseXpStore 와 같은 인터페이스 / 같은 규칙.
+
+        app.dependency_overrides[get_xp_store] = lambda: InMemoryXpStore()
+    """
+
+    def __init__(self):
+        self.user_stats: Dict[int, Dict[str, Any]] = {}
+        self.xp_events: Dict[Tuple[int, str, int, date], Dict[str, Any]] = {}
+        self.action_logs: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+
+    def _row(self, user_id: int) -> Dict[str, Any]:
+        return self.user_stats.setdefault(user_id, {
+            "user_id": user_id,
+            "level": 1,
+            "xp": 0,
+            "streak_days": 0,
+            "daily_xp": 0,
+            "daily_xp_date": None,
+            "last_checkin_date": None,
+            "daily_mood_xp_date": None,
+            "daily_journal_xp_date": None,
+        })
+
+    async def apply(
+        self,
+        *,
+        user_id: int,
+        source: str,
+        amount: int,
+        local_day: date,
+        source_id: int = 0,
+    ) -> Dict[str, Any]:
+        # RPC 의 FOR UPDATE 와 같은 역할
+        async with self._lock:
+            row = self._row(user_id)
+            key = (user_id, source, source_id, local_day)
+
+            update, result = apply_xp_event(
+                row,
+                source=source,
+                amount=amount,
+                today=local_day,
+                duplicate=key in self.xp_events,
+            )
+            # cap 으로 적립이 없으면 가드를 쓰지 않는다 (daily_journal 은 저장 가드라 예외)
+            if key not in self.xp_events and (result["gained_xp"] > 0 or source == "daily_journal"):
+                self.xp_events[key] = {"amount": amount, "gained": result["gained_xp"]}
+
+            if update is None:
+                return result
+
+            row.update(update)
+            if source == "action":
+                self.action_logs.append({
+                    "user_id": user_id,
+                    "action_id": source_id,
+                    "completed_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+                })
+
+            return result
+
+
+async def get_xp_store(supabase=Depends(get_supabase)) -> SupabaseXpStore:
+    return SupabaseXpStore(supabase)
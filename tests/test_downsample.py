@@ -0,0 +1,33 @@
+# tests/test_downsample.py
+import numpy as np
+
+from utils.downsample import lttb_indices
+
+
+def test_short_series_is_returned_as_is():
+    x = np.arange(5)
+    assert lttb_indices(x, x * 2.0, 5).tolist() == [0, 1, 2, 3, 4]
+    assert lttb_indices(x, x * 2.0, 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_fewer_than_three_points_keeps_endpoints():
+    x = np.arange(10)
+    assert lttb_indices(x, np.zeros(10), 2).tolist() == [0, 9]
+
+
+def test_output_size_order_and_endpoints():
+    rng = np.random.default_rng(0)
+    x = np.arange(500)
+    y = rng.normal(size=500)
+    idx = lttb_indices(x, y, 50)
+    assert len(idx) == 50
+    assert idx[0] == 0 and idx[-1] == 499
+    assert (np.diff(idx) > 0).all()
+
+
+def test_keeps_peak_and_dip():
+    x = np.arange(100)
+    y = np.zeros(100)
+    y[37], y[71] = 10.0, -10.0
+    idx = lttb_indices(x, y, 10).tolist()
+    assert 37 in idx and 71 in idx
@@ -0,0 +1,90 @@
+# tests/test_history_service.py
+import asyncio
+
+from services.history_service import ACTION_LOGS, iter_rows
+from utils.pagination import decode_cursor
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    """iter_rows 가 쓰는 PostgREST builder 만 흉내 낸다 (id 내림차순 keyset)."""
+
+    def __init__(self, table):
+        self.table = table
+        self.after = None
+        self.size = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def or_(self, expression):
+        # 'id.lt."<n>"'
+        self.after = int(expression.split('"')[1])
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    async def execute(self):
+        self.table.limits.append(self.size)
+        rows = [r for r in self.table.rows if self.after is None or r["id"] < self.after]
+        return _Result(rows[: self.size])
+
+
+class _FakeSupabase:
+    def __init__(self, n):
+        self.rows = [{"id": i} for i in range(n, 0, -1)]
+        self.limits = []
+
+    def table(self, name):
+        return _Query(self)
+
+
+def _collect(supabase, **kwargs):
+    async def run():
+        return [item async for item in iter_rows(supabase, ACTION_LOGS, user_id=1, columns=["id"], **kwargs)]
+    return asyncio.run(run())
+
+
+def test_iter_rows_stops_on_short_chunk():
+    supabase = _FakeSupabase(5)
+    items = _collect(supabase, chunk_size=2)
+    assert [row["id"] for row, _ in items] == [5, 4, 3, 2, 1]
+    # 2, 2, 1 → 마지막 chunk 가 size 보다 작으면 더 읽지 않는다
+    assert supabase.limits == [2, 2, 2]
+
+
+def test_iter_rows_exact_multiple_needs_one_empty_chunk():
+    supabase = _FakeSupabase(4)
+    items = _collect(supabase, chunk_size=2)
+    assert [row["id"] for row, _ in items] == [4, 3, 2, 1]
+    assert supabase.limits == [2, 2, 2]
+
+
+def test_iter_rows_limit_shrinks_last_chunk():
+    supabase = _FakeSupabase(10)
+    items = _collect(supabase, chunk_size=3, limit=7)
+    assert [row["id"] for row, _ in items] == [10, 9, 8, 7, 6, 5, 4]
+    # remaining 만큼만 요청: 3, 3, 1
+    assert supabase.limits == [3, 3, 1]
+
+
+def test_iter_rows_resumes_from_yielded_cursor():
+    supabase = _FakeSupabase(6)
+    first = _collect(supabase, chunk_size=2, limit=3)
+    cursor = first[-1][1]
+    assert decode_cursor(cursor, ACTION_LOGS.keys) == {"id": 4}
+
+    rest = _collect(_FakeSupabase(6), chunk_size=2, cursor=cursor)
+    assert [row["id"] for row, _ in rest] == [3, 2, 1]
@@ -0,0 +1,93 @@
+# tests/test_mood_trends.py
+from datetime import date, timedelta
+
+import pytest
+
+from services.mood_trends_service import compute_trends, resolve_trend_range
+
+START = date(2026, 10, 5)   # 월요일
+END = date(2026, 10, 11)
+
+
+def _row(day: date, count: int, valence_sum: int, energy_sum: int, trigger=None, tags=None):
+    return {
+        "date": day.isoformat(),
+        "mood_count": count,
+        "valence_sum": valence_sum,
+        "energy_sum": energy_sum,
+        "last_trigger_type": trigger,
+        "tag_counts": tags or {},
+    }
+
+
+def _trends(rows, window=1, max_points=100):
+    return compute_trends(
+        rows, range_key="7d", start_date=START, end_date=END, window=window, max_points=max_points,
+    )
+
+
+def test_no_moods_returns_empty():
+    res = _trends([_row(START, 0, 0, 0)])
+    assert res["days"] == 0 and res["moods"] == 0
+    assert res["points"]["date"] == [] and res["summary"] is None
+
+
+def test_daily_average_and_mood_weighted_summary():
+    rows = [
+        _row(START, 2, 2, 6),                       # 일 평균 valence 1, energy 3
+        _row(START + timedelta(days=2), 1, -1, 1),  # -1, 1
+    ]
+    res = _trends(rows)
+    assert res["days"] == 2 and res["moods"] == 3
+    assert res["points"]["date"] == ["2026-10-05", "2026-10-07"]
+    assert res["points"]["valence"] == [1.0, -1.0]
+    assert res["points"]["energy"] == [3.0, 1.0]
+    # 기간 평균은 mood 가중: (2 - 1) / 3
+    assert res["summary"]["valence"] == pytest.approx(0.333)
+    assert res["weekday"]["count"] == [2, 0, 1, 0, 0, 0, 0]
+    assert res["distribution"]["valence"] == [0, 1, 0, 1, 0]
+
+
+def test_rolling_average_uses_days_before_range():
+    # window=3: START 의 평균에 START-2 (rows 앞쪽) 기록까지 포함
+    rows = [
+        _row(START - timedelta(days=2), 1, 2, 5),
+        _row(START, 1, -2, 1),
+    ]
+    res = _trends(rows, window=3)
+    assert res["points"]["date"] == ["2026-10-05"]
+    assert res["points"]["valenceAvg"] == [0.0]
+    assert res["points"]["energyAvg"] == [3.0]
+    # 요청 기간 밖 기록은 집계에 들어가지 않는다
+    assert res["moods"] == 1
+
+
+def test_points_are_downsampled_to_max_points():
+    rows = [_row(START + timedelta(days=i), 1, (-1) ** i, 3) for i in range(7)]
+    res = _trends(rows, max_points=4)
+    assert len(res["points"]["date"]) == 4
+    assert res["points"]["date"][0] == "2026-10-05"
+    assert res["points"]["date"][-1] == "2026-10-11"
+
+
+def test_triggers_and_tags():
+    rows = [
+        _row(START, 1, 2, 3, trigger="work", tags={"calm": 1}),
+        _row(START + timedelta(days=1), 1, -2, 3, trigger="work"),
+        _row(START + timedelta(days=2), 1, 2, 3, trigger="family", tags={"calm": 1}),
+    ]
+    res = _trends(rows)
+    assert [(t["type"], t["days"]) for t in res["triggers"]] == [("work", 2), ("family", 1)]
+    [calm] = res["tags"]
+    assert calm["code"] == "calm" and calm["days"] == 2
+    assert calm["valence"] == 2.0
+    assert calm["valenceDelta"] == 4.0
+    assert calm["corr"] == pytest.approx(1.0)
+
+
+def test_resolve_custom_range_validation():
+    assert resolve_trend_range("custom", START, END) == (START, END)
+    with pytest.raises(ValueError):
+        resolve_trend_range("custom", END, START)
+    with pytest.raises(ValueError):
+        resolve_trend_range("custom", START, None)
@@ -0,0 +1,56 @@
+# tests/test_pagination.py
+import base64
+import json
+
+import pytest
+
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+KEYS = ("date", "created_at", "id")
+
+
+def _raw_cursor(values) -> str:
+    # encode_cursor 를 거치지 않은 (변조된) cursor
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_keyset_filter_expands_tuple_comparison():
+    values = {"date": "2026-10-18", "created_at": "2026-10-18T01:00:00", "id": 7}
+    assert keyset_filter(KEYS, values) == (
+        'date.lt."2026-10-18",'
+        'and(date.eq."2026-10-18",created_at.lt."2026-10-18T01:00:00"),'
+        'and(date.eq."2026-10-18",created_at.eq."2026-10-18T01:00:00",id.lt."7")'
+    )
+
+
+def test_keyset_filter_ascending_single_key():
+    assert keyset_filter(("id",), {"id": 3}, desc=False) == 'id.gt."3"'
+
+
+def test_keyset_filter_quotes_special_characters():
+    # PostgREST 구분자 (, . : ( )) 와 따옴표 / backslash 가 값 밖으로 새지 않아야 한다
+    assert keyset_filter(("name",), {"name": 'a,b.(c):"d"\\'}) == r'name.lt."a,b.(c):\"d\"\\"'
+
+
+def test_cursor_round_trip():
+    values = {"date": "2026-10-18", "created_at": "2026-10-18T01:00:00+00:00", "id": 42}
+    assert decode_cursor(encode_cursor(values), KEYS) == values
+
+
+@pytest.mark.parametrize("values", [
+    {"date": "2026-10-18", "created_at": "2026-10-18T01:00:00", "id": "42"},     # id 가 문자열
+    {"date": "2026-10-18", "created_at": "2026-10-18T01:00:00", "id": True},     # bool 은 int 가 아님
+    {"date": "not-a-date", "created_at": "2026-10-18T01:00:00", "id": 1},
+    {"date": "2026-10-18", "created_at": "yesterday", "id": 1},
+    {"date": 20261018, "created_at": "2026-10-18T01:00:00", "id": 1},
+    {"date": "2026-10-18", "id": 1},                                             # key 누락
+    ["2026-10-18", "2026-10-18T01:00:00", 1],                                    # dict 가 아님
+])
+def test_decode_cursor_rejects_tampered_values(values):
+    with pytest.raises(ValueError):
+        decode_cursor(_raw_cursor(values), KEYS)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("%%%not-base64%%%", KEYS)
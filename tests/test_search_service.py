@@ -0,0 +1,51 @@
+# tests/test_search_service.py
+from services.search_service import MAX_TERMS, SNIPPET_BEFORE, SNIPPET_LENGTH, make_snippet, split_terms
+
+
+def _matched(snippet):
+    return [snippet["text"][s:e] for s, e in snippet["matches"]]
+
+
+def test_short_content_offsets():
+    snippet = make_snippet("오늘은 산책을 했다. 산책 좋아", ["산책"])
+    assert snippet["text"] == "오늘은 산책을 했다. 산책 좋아"
+    assert snippet["matches"] == [[4, 6], [12, 14]]
+
+
+def test_offsets_are_case_insensitive_and_keep_original_text():
+    snippet = make_snippet("Walk, then WALK again", ["walk"])
+    assert _matched(snippet) == ["Walk", "WALK"]
+
+
+def test_offsets_include_ellipsis_prefix():
+    content = "가" * 100 + "산책" + "나" * 200
+    snippet = make_snippet(content, ["산책"])
+    text = snippet["text"]
+    assert text.startswith("…") and text.endswith("…")
+    assert len(text) == SNIPPET_LENGTH + 2
+    # 첫 일치 앞 SNIPPET_BEFORE 글자 + "…" 1글자
+    assert snippet["matches"] == [[SNIPPET_BEFORE + 1, SNIPPET_BEFORE + 3]]
+    assert _matched(snippet) == ["산책"]
+
+
+def test_window_shifts_back_near_the_end():
+    content = "가" * 300 + "끝"
+    snippet = make_snippet(content, ["끝"])
+    assert snippet["text"] == "…" + content[-SNIPPET_LENGTH:]
+    assert _matched(snippet) == ["끝"]
+
+
+def test_multiple_terms_sorted_by_offset():
+    snippet = make_snippet("비 오는 날 카페에서 비를 봤다", ["카페", "비"])
+    assert snippet["matches"] == [[0, 1], [7, 9], [12, 13]]
+
+
+def test_no_match_returns_head():
+    snippet = make_snippet("x" * 200, ["없음"])
+    assert snippet["text"] == "x" * SNIPPET_LENGTH + "…"
+    assert snippet["matches"] == []
+
+
+def test_split_terms_dedupes_and_caps():
+    assert split_terms("  산책  카페 산책 ") == ["산책", "카페"]
+    assert len(split_terms(" ".join(str(i) for i in range(20)))) == MAX_TERMS
@@ -0,0 +1,36 @@
+# utils/downsample.py
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: 차트 모양(peak / dip)을 유지하며 n_out 개 point 선택.
+    x 는 오름차순. 첫 / 마지막 point 는 항상 포함. returns: 선택된 index (오름차순)
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # 양 끝을 뺀 n - 2 개를 n_out - 2 개 bucket 으로
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 다음 bucket 평균 (마지막 bucket 다음은 마지막 point)
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+
+        # 직전 선택 point a, 다음 bucket 평균 c 와 이루는 삼각형 넓이가 최대인 point
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+
+    return out
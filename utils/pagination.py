@@ -0,0 +1,84 @@
+# utils/pagination.py
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _valid_key_value(key: str, value: Any) -> bool:
+    # 컬럼 이름으로 타입 판단: id / *_id = int, date = date, *_at = timestamp
+    if key == "id" or key.endswith("_id"):
+        return isinstance(value, int) and not isinstance(value, bool)
+    if not isinstance(value, str):
+        return False
+    try:
+        if key == "date":
+            date.fromisoformat(value)
+        elif key.endswith("_at"):
+            datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> Dict[str, Any]:
+    """
+    잘못된 cursor 는 ValueError.
+    key 별 값 타입까지 확인 (변조된 값이 PostgREST cast 오류 = 500 이 되지 않도록)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(values, dict) or any(k not in values for k in keys):
+        raise ValueError("invalid cursor")
+    if not all(_valid_key_value(k, values[k]) for k in keys):
+        raise ValueError("invalid cursor")
+    return values
+
+
+def _quote(value: Any) -> str:
+    # PostgREST logic filter 값: , . : ( ) 가 들어갈 수 있으므로 항상 따옴표
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def keyset_filter(keys: Sequence[str], values: Dict[str, Any], *, desc: bool = True) -> str:
+    """
+    (k1, k2, k3) < (v1, v2, v3) 를 PostgREST or=() 식으로.
+        k1.lt.v1, and(k1.eq.v1, k2.lt.v2), and(k1.eq.v1, k2.eq.v2, k3.lt.v3)
+    """
+    op = "lt" if desc else "gt"
+    clauses: List[str] = []
+    for i, key in enumerate(keys):
+        eqs = [f"{k}.eq.{_quote(values[k])}" for k in keys[:i]]
+        cmp = f"{key}.{op}.{_quote(values[key])}"
+        clauses.append(f"and({','.join(eqs + [cmp])})" if eqs else cmp)
+    return ",".join(clauses)
+
+
+def parse_fields(
+    fields: Optional[str],
+    *,
+    allowed: Sequence[str],
+    default: Sequence[str],
+    required: Sequence[str],
+) -> List[str]:
+    """
+    ?fields=a,b 를 허용 목록으로 검증. keyset key(required) 는 항상 포함.
+    허용되지 않은 field 는 ValueError
+    """
+    if not fields:
+        selected = list(default)
+    else:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in allowed]
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys([*required, *selected]))
@@ -0,0 +1,31 @@
+# utils/timezone.py
+from datetime import date, datetime, time, timedelta, timezone
+
+
+def user_local_date(tz_offset_min: int) -> date:
+    """
+    tz_offset_min: user timezone offset in minutes (KST = 540)
+    returns: 사용자 로컬 기준 오늘 날짜
+    """
+    return (datetime.now(timezone.utc) + timedelta(minutes=tz_offset_min)).date()
+
+
+def user_today_range_utc(tz_offset_min: int):
+    """
+    tz_offset_min: user timezone offset in minutes (KST = 540)
+    returns: (today_str, utc_start_iso, utc_end_iso)
+    """
+    offset = timedelta(minutes=tz_offset_min)
+    user_today = user_local_date(tz_offset_min)
+
+    user_start = datetime.combine(user_today, time.min)
+    user_end = datetime.combine(user_today, time.max)
+
+    utc_start = (user_start - offset)
+    utc_end = (user_end - offset)
+
+    return (
+        user_today.isoformat(),
+        utc_start.isoformat(),
+        utc_end.isoformat(),
+    )